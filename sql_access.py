@@ -6,26 +6,483 @@
 # Description : Routines to access and modify SQL database and table.
 ##############################################################################################
 
+import csv
+import json
 import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from itertools import islice
+from queue import Queue
 
 from sql_utils import *
 
+# Suffix of the shadow columns holding the normalized (noaccent) value of a column => SQLTable.define_normalized_keys
+NORMALIZED_SUFFIX = "__noaccent"
+
+# Default number of statements kept in each SQLTable statement cache (and in sqlite3 statement cache)
+STATEMENT_CACHE_SIZE = 128
+
+# Suffix of the FTS5 external-content index of a table => SQLTable.define_fulltext_keys
+FULLTEXT_SUFFIX = "__fts"
+
+# Tuning profiles of SQLDatabase => PRAGMA applied to every connection (explicit parameters take precedence)
+#   - bulk_load : WAL without fsync (a power loss can lose the last commits, never corrupt), big page cache
+#   - read_heavy: WAL, fsync at checkpoint only, big page cache & memory-mapped I/O
+#   - durable   : WAL with fsync at every commit
+PRAGMA_PROFILES = {
+    'default': {},
+    'bulk_load': {'journal_mode': 'WAL', 'synchronous': 'OFF', 'cache_size': -262144, 'temp_store': 'MEMORY',
+                  'busy_timeout': 5000},
+    'read_heavy': {'journal_mode': 'WAL', 'synchronous': 'NORMAL', 'cache_size': -65536, 'mmap_size': 268435456,
+                   'temp_store': 'MEMORY', 'busy_timeout': 5000},
+    'durable': {'journal_mode': 'WAL', 'synchronous': 'FULL', 'busy_timeout': 5000},
+}
+
+# PRAGMA of the database file, set once by the writer (page_size before journal_mode: fixed once in WAL)
+DATABASE_PRAGMAS = ('page_size', 'journal_mode')
+
+# PRAGMA of each connection
+CONNECTION_PRAGMAS = ('synchronous', 'cache_size', 'mmap_size', 'temp_store', 'busy_timeout')
+
+# Number of pages copied per step of SQLDatabase.backup (-1 => whole database at once)
+BACKUP_PAGES_PER_STEP = 1024
+
+# Number of rows written (and committed) at once by SQLTable.import_csv / SQLTable.import_jsonl
+IMPORT_CHUNK_SIZE = 10000
+
+# Suffix of the sidecar file receiving the rows rejected by SQLTable.import_csv / SQLTable.import_jsonl
+REJECT_SUFFIX = ".rejects"
+
+# Number of SQLite virtual machine instructions between two checks of a running statement => enable_metrics
+PROGRESS_STEPS = 100000
+
+
+class TimedCursor(sqlite3.Cursor):
+    """
+    Cursor timing each execute/executemany (rows fetched afterwards are not included) => SQLDatabase.enable_metrics
+    """
+    metrics = None
+
+    def execute(self, sql, parameters=()):
+        self.metrics.begin(sql)
+        start = time.perf_counter()
+        try:
+            result = super().execute(sql, parameters)
+        except BaseException:
+            self.metrics.statement(sql, len(parameters), time.perf_counter() - start, error=True)
+            raise
+        self.metrics.statement(sql, len(parameters), time.perf_counter() - start)
+        return result
+
+    def executemany(self, sql, seq_of_parameters):
+        if not isinstance(seq_of_parameters, (list, tuple)):
+            seq_of_parameters = list(seq_of_parameters)
+        binds = sum(len(parameters) for parameters in seq_of_parameters)
+        self.metrics.begin(sql)
+        start = time.perf_counter()
+        try:
+            result = super().executemany(sql, seq_of_parameters)
+        except BaseException:
+            self.metrics.statement(sql, binds, time.perf_counter() - start, error=True)
+            raise
+        self.metrics.statement(sql, binds, time.perf_counter() - start)
+        return result
+
+
+def instrumented(function):
+    """
+    Decorator of the SQLTable methods: record their latency when the metrics of the database are enabled
+    """
+    name = function.__name__
+
+    @wraps(function)
+    def wrapper(self, *args, **kwargs):
+        metrics = self.db.metrics
+        if metrics is None:
+            return function(self, *args, **kwargs)
+        start = time.perf_counter()
+        try:
+            result = function(self, *args, **kwargs)
+        except BaseException:
+            metrics.operation(self.tableName + "." + name, time.perf_counter() - start, error=True)
+            raise
+        metrics.operation(self.tableName + "." + name, time.perf_counter() - start)
+        return result
+    return wrapper
+
 
 class SQLDatabase:
     """
     Manage Database
     """
 
-    def __init__(self, databaseName="/default/directory/DBName"):
+    def __init__(self, databaseName="/default/directory/DBName", statementCacheSize=STATEMENT_CACHE_SIZE, readers=0,
+                 profile=None, **pragmas):
         """
         Connect to the database & create cursor.
 
+        Pooled mode (readers > 0): the database is switched to WAL, this connection becomes the only writer
+        (serialized by a lock) and 'readers' read-only connections are shared between threads.
+        SQLTable routes reads to the readers => writes are visible to readers once committed.
+
         :param databaseName: DB file to create/read
+        :param statementCacheSize: size of the statement cache of each SQLTable, sqlite3 keeps as many prepared statements
+        :param readers: number of reader connections, 0 => one connection used by a single thread
+        :param profile: tuning profile 'bulk_load', 'read_heavy' or 'durable' => see PRAGMA_PROFILES, SQLite defaults if None
+        :param pragmas: explicit PRAGMA overriding the profile: journal_mode, synchronous, cache_size, mmap_size,
+                        temp_store, page_size, busy_timeout => see SQLDatabase.settings for the effective values
         """
-        self.base = sqlite3.connect(databaseName)
-        self.base.create_function("noaccent", 1, translate_no_accent_nocase_sensitive)
-        self.cursor = self.base.cursor()
         self.SQLdblog = Logger(name='SQLDatabase', severity=logging.INFO)
+        self.databaseName = databaseName
+        self.statementCacheSize = statementCacheSize
+        self.readers = readers
+        self.writerLock = threading.RLock()                              # Serialize the use of the writer connection
+        self.local = threading.local()                                   # Writer & reader depth of the current thread
+        self.readerPool = Queue()                                        # Reader connections available
+        self.transactionDepth = 0                                        # Nesting of SQLDatabase.transaction
+        self.groupCommit = None                                          # (rows, milliseconds) => group_commit
+        self.pendingRows = 0                                             # Rows written by SQLTable since last commit
+        self.firstChange = None                                          # time of the first uncommitted change
+        self.tableVersions = {}                                          # Write counter of each table
+        self.cacheEpoch = 0                                              # Changed when any write is rolled back
+        self.dataVersions = {}                                           # Connection => last PRAGMA data_version
+        self.metrics = None                                              # => enable_metrics
+        self.connections = []                                            # Writer & reader connections
+        self.attached = {}                                               # DB file => schema name (ATTACH)
+        self.tableCache = {}                                             # Table name => SQLTable (open_table)
+        self.metadata = None                                             # (schema_version, metadata) => tables
+
+        if readers and databaseName == ':memory:':
+            self.SQLdblog.error(functionName="__init__", message="Pooled mode needs a database file")
+            raise SqlPoolError("Pooled mode needs a database file: ':memory:' cannot be shared between connections")
+        self.pragmas = self.__pragmas(profile, pragmas)                  # PRAGMA applied to the connections
+        if readers:
+            if str(self.pragmas.setdefault('journal_mode', 'WAL')).upper() != 'WAL':
+                self.SQLdblog.error(functionName="__init__", message="Pooled mode needs journal_mode=WAL")
+                raise SqlPoolError("Pooled mode needs journal_mode=WAL, not " + str(self.pragmas['journal_mode']))
+
+        self.base = self.__connect()
+        self.cursor = self.base.cursor()
+        self.connections.append(self.base)
+        for name in DATABASE_PRAGMAS:
+            if name in self.pragmas:
+                self.cursor.execute("PRAGMA " + name + "=" + str(self.pragmas[name])).fetchall()
+        if readers:
+            for i in range(readers):
+                reader = self.__connect()
+                reader.execute("PRAGMA query_only=1")
+                self.connections.append(reader)
+                self.readerPool.put(reader)
+
+    def __connect(self):
+        """
+        Implicit function to open a connection with 'noaccent' function registered
+
+        :return: sqlite3 connection
+        """
+        connection = sqlite3.connect(self.databaseName, cached_statements=self.statementCacheSize,
+                                     check_same_thread=not self.readers)
+        # deterministic => usable in indexes (SQLTable.define_filter_for_insertion with unique=True)
+        connection.create_function("noaccent", 1, noaccent, deterministic=True)
+        for name in CONNECTION_PRAGMAS:
+            if name in self.pragmas:
+                connection.execute("PRAGMA " + name + "=" + str(self.pragmas[name]))
+        return connection
+
+    def __pragmas(self, profile, pragmas):
+        """
+        Implicit function to merge the profile & the explicit PRAGMA, values are checked (no SQL injection)
+
+        :return: dictionary {<pragma>: <value>}
+        """
+        if profile is not None and profile not in PRAGMA_PROFILES:
+            self.SQLdblog.error(functionName="__init__", message="Unknown profile: " + str(profile))
+            raise SqlNameParameterError(str(profile) + " is an Unknown profile: " + str(list(PRAGMA_PROFILES)))
+        merged = dict(PRAGMA_PROFILES[profile or 'default'])
+        for name, value in pragmas.items():
+            if name not in DATABASE_PRAGMAS + CONNECTION_PRAGMAS:
+                self.SQLdblog.error(functionName="__init__", message="Unknown PRAGMA: " + str(name))
+                raise SqlNameParameterError(str(name) + " is an Unknown PRAGMA: " +
+                                            str(list(DATABASE_PRAGMAS + CONNECTION_PRAGMAS)))
+            if not isinstance(value, int) and not str(value).isalpha():
+                raise SqlTypeParameterError("PRAGMA " + name + ": integer or keyword expected, get " + repr(value))
+            merged[name] = value
+        return merged
+
+    def settings(self):
+        """
+        Effective PRAGMA of the writer connection (SQLite may refuse a value, ex: WAL for ':memory:')
+
+        :return: dictionary {'journal_mode': 'wal', 'synchronous': 'NORMAL', 'cache_size': ..., 'mmap_size': ...,
+                             'temp_store': 'MEMORY', 'page_size': ..., 'busy_timeout': ...}
+        """
+        names = {'synchronous': ('OFF', 'NORMAL', 'FULL', 'EXTRA'), 'temp_store': ('DEFAULT', 'FILE', 'MEMORY')}
+        settings = {}
+        with self.writer() as cursor:
+            for name in DATABASE_PRAGMAS + CONNECTION_PRAGMAS:
+                cursor.execute("PRAGMA " + name)
+                row = cursor.fetchone()
+                value = row[0] if row else None
+                settings[name] = names[name][value] if name in names and value is not None else value
+        return settings
+
+    def invalidate(self, table=None):
+        """
+        Invalidate the results cached by SQLTable (see SQLTable.enable_result_cache)
+
+        :param table: table modified, every table if None (ex: rollback)
+        :return: None
+        """
+        if table is None:
+            self.cacheEpoch += 1
+        else:
+            self.tableVersions[table] = self.tableVersions.get(table, 0) + 1
+
+    def written(self, table, rows):
+        """
+        Record a write of SQLTable: results cached for the table are invalidated and the rows written by the
+        statement are counted by the group-commit policy
+
+        :param table: table modified
+        :param rows: rows written by the statement (cursor.rowcount)
+        :return: None
+        """
+        self.invalidate(table)
+        self.pendingRows += max(rows, 0)
+
+    def data_version(self, table):
+        """
+        Version of the data of a table seen by this wrapper: changed by writes through SQLTable, commits, rollbacks
+        and commits of other connections (PRAGMA data_version of the connection read, counter of its own)
+        Read on the reader checked out by the current thread => no writer lock, call it inside SQLDatabase.reader.
+
+        :param table: table name
+        :return: hashable version, None if the results must not be cached (pooled mode, read through the writer
+                 inside a transaction => uncommitted rows, not visible by the other threads)
+        """
+        with self.reader() as cursor:
+            connection = cursor.connection
+            if self.readers and connection is self.base and self.base.in_transaction:
+                return None
+            dataVersion = connection.execute("PRAGMA data_version").fetchone()[0]
+            if self.dataVersions.get(connection) != dataVersion:
+                self.dataVersions[connection] = dataVersion
+                self.invalidate()                                        # Committed by another connection
+            return self.cacheEpoch, self.tableVersions.get(table, 0)
+
+    def enable_metrics(self, slowQuery=None, progressSteps=PROGRESS_STEPS):
+        """
+        Record counters & latency histograms of the SQLTable methods and of the statements => see stats
+        Disabled by default: nothing is measured (nor any callback registered) until this call.
+
+        :param slowQuery: threshold in seconds, statements slower are logged (WARNING) with their bind count,
+                          statements still running after it are logged too (progress handler)
+        :param progressSteps: number of SQLite instructions between two checks of a running statement
+        :return: None
+        """
+        with self.writer():
+            self.metrics = Metrics(slowQuery=slowQuery, logger=self.SQLdblog)
+            for connection in self.connections:
+                connection.set_trace_callback(self.metrics.trace)
+                if slowQuery is not None:
+                    connection.set_progress_handler(self.metrics.progress, progressSteps)
+                else:
+                    connection.set_progress_handler(None, 0)
+            self.cursor = self.open_cursor(self.base)
+
+    def disable_metrics(self):
+        """
+        Stop recording metrics & remove the callbacks of the connections
+
+        :return: None
+        """
+        with self.writer():
+            self.metrics = None
+            for connection in self.connections:
+                connection.set_trace_callback(None)
+                connection.set_progress_handler(None, 0)
+            self.cursor = self.base.cursor()
+
+    def open_cursor(self, connection):
+        """
+        Open a cursor on one of the connections, timed if the metrics are enabled
+
+        :param connection: sqlite3 connection
+        :return: cursor
+        """
+        if self.metrics is None:
+            return connection.cursor()
+        cursor = connection.cursor(TimedCursor)
+        cursor.metrics = self.metrics
+        return cursor
+
+    def stats(self):
+        """
+        Snapshot of the metrics of the database
+
+            - 'operations': <table>.<method> => {'count', 'errors', 'seconds', 'mean', 'p50', 'p99', 'max', 'buckets'}
+            - 'statements': SQL text => same statistics (execution only)
+            - 'executed'  : statement verb => number of statements run by SQLite (implicit ones included)
+            - 'slowQueries': number of statements above the slow threshold
+            - 'noaccent'  : statistics of the 'noaccent' function
+
+        :return: dictionary, 'enabled' is False (and counters empty) if enable_metrics was not called
+        """
+        snapshot = self.metrics.snapshot() if self.metrics is not None else \
+            {'operations': {}, 'statements': {}, 'executed': {}, 'slowQueries': 0}
+        snapshot['enabled'] = self.metrics is not None
+        snapshot['noaccent'] = self.noaccent_stats()
+        return snapshot
+
+    def noaccent_stats(self):
+        """
+        Statistics of the 'noaccent' function (shared by every connection) => see NoAccent.stats
+
+        :return: dictionary of statistics
+        """
+        return noaccent.stats()
+
+    @contextmanager
+    def writer(self):
+        """
+        Check out the writer cursor (lock held until the end of the block, re-entrant)
+
+        :return: cursor of the writer connection
+        """
+        with self.writerLock:
+            self.local.depth = getattr(self.local, 'depth', 0) + 1
+            try:
+                yield self.cursor
+            finally:
+                self.local.depth -= 1
+            if self.groupCommit and not self.local.depth and not self.transactionDepth:
+                self.__apply_group_commit()
+
+    @contextmanager
+    def transaction(self):
+        """
+        Run a block in a transaction: with db.transaction(): ...
+            - outermost block: committed at the end, rolled back if an exception occurs
+            - nested block   : savepoint released at the end, rolled back to if an exception occurs
+        Changes pending before the outermost block (ex: group commit) are kept if the block fails:
+        the block then runs in a savepoint, and everything is committed at its end.
+
+        :return: cursor of the writer connection
+        """
+        with self.writer() as cursor:
+            depth = self.transactionDepth
+            savepoint = "transaction_" + str(depth)
+            nested = depth or self.base.in_transaction
+            if nested:
+                cursor.execute("SAVEPOINT " + savepoint)
+            else:
+                cursor.execute("BEGIN")
+
+            self.transactionDepth += 1
+            try:
+                yield cursor
+            except BaseException:
+                self.transactionDepth -= 1
+                self.invalidate()
+                if nested:
+                    cursor.execute("ROLLBACK TO " + savepoint)
+                    cursor.execute("RELEASE " + savepoint)
+                else:
+                    self.SQLdblog.debug(functionName="transaction",
+                                        message="Rollback of the transaction")
+                    self.base.rollback()
+                    self.__reset_group_commit()
+                raise
+            self.transactionDepth -= 1
+            if nested:
+                cursor.execute("RELEASE " + savepoint)
+            if not depth:
+                self.commit()
+
+    @contextmanager
+    def savepoint(self, name="savepoint"):
+        """
+        Run a block atomically WITHOUT committing: with db.savepoint(): ...
+        Changes stay pending (SQLDatabase.commit) if the block succeeds, they are rolled back if an exception occurs.
+
+        :param name: name of the savepoint (quoted => any name, even a keyword)
+        :return: cursor of the writer connection
+        """
+        with self.writer() as cursor:
+            if not self.base.in_transaction:
+                cursor.execute("BEGIN")
+            cursor.execute('SAVEPOINT "' + name + '"')
+            try:
+                yield cursor
+            except BaseException:
+                self.invalidate()
+                cursor.execute('ROLLBACK TO "' + name + '"')
+                cursor.execute('RELEASE "' + name + '"')
+                raise
+            cursor.execute('RELEASE "' + name + '"')
+
+    def group_commit(self, rows=None, milliseconds=None):
+        """
+        Define a group-commit policy: pending changes are committed automatically after the statements of
+        SQLTable have written 'rows' rows (their rowcount: rows changed by triggers are not counted),
+        or 'milliseconds' elapsed since the first uncommitted change.
+        Policy is checked at the end of each write (outside SQLDatabase.transaction), so fsyncs are amortized
+        over many rows with a bounded durability lag while writes keep coming.
+
+        :param rows: number of rows written by the statements before commit, None to disable
+        :param milliseconds: maximum age of the first uncommitted change, None to disable
+        :return: None
+        """
+        self.groupCommit = (rows, milliseconds) if rows or milliseconds is not None else None
+        self.__reset_group_commit()
+
+    def __apply_group_commit(self):
+        """
+        Implicit function to commit if the group-commit policy is reached => called at the end of each write
+
+        :return: None
+        """
+        if not self.base.in_transaction:
+            return
+        now = time.monotonic()
+        if self.firstChange is None:
+            self.firstChange = now
+
+        rows, milliseconds = self.groupCommit
+        if (rows and self.pendingRows >= rows) or (milliseconds is not None and (now - self.firstChange) * 1000 >= milliseconds):
+            self.commit()
+
+    def __reset_group_commit(self):
+        self.pendingRows = 0
+        self.firstChange = None
+
+    @contextmanager
+    def reader(self):
+        """
+        Check out a reader cursor: a reader connection in pooled mode,
+        the writer cursor otherwise or if the current thread is writing (uncommitted data must be visible)
+        Re-entrant: a thread already holding a reader (ex: read while iterating) gets the same connection,
+        so it never waits for a connection it holds itself.
+
+        :return: cursor
+        """
+        if not self.readers or getattr(self.local, 'depth', 0):
+            yield self.cursor
+        else:
+            readerDepth = getattr(self.local, 'readerDepth', 0)
+            if not readerDepth:
+                self.local.readerConnection = self.readerPool.get()
+            connection = self.local.readerConnection
+            self.local.readerDepth = readerDepth + 1
+            try:
+                yield self.open_cursor(connection)
+            finally:
+                self.local.readerDepth -= 1
+                if not self.local.readerDepth:
+                    self.local.readerConnection = None
+                    self.readerPool.put(connection)
 
     def commit(self):
         """
@@ -35,7 +492,86 @@ class SQLDatabase:
         """
         self.SQLdblog.debug(functionName="commit",
                             message="Commit into Database")
-        self.base.commit()
+        with self.writer():
+            self.base.commit()
+            self.__reset_group_commit()
+            self.invalidate()                                            # Readers now see the committed data
+
+    def backup(self, dest, pages_per_step=BACKUP_PAGES_PER_STEP, sleep=0.005, progress=None, vacuum=False):
+        """
+        Copy the committed content of the database while it is in use (sqlite3 online backup API).
+        The copy is done by steps of 'pages_per_step' pages, locks are released between steps:
+        in pooled mode a reader connection is used => the writer is not blocked (a step restarts the copy
+        if the database changed meanwhile). Otherwise the writer connection is read: commit before.
+
+        :param dest: DB file, SQLDatabase (ex: SQLDatabase(':memory:') => read replica) or sqlite3 connection
+        :param pages_per_step: number of pages copied per step, -1 => everything in one step
+        :param sleep: seconds between two steps
+        :param progress: function(status, remaining, total) called after each step
+        :param vacuum: True => compacted snapshot with 'VACUUM INTO' (dest must be a new file, no progress)
+        :return: None
+        """
+        if vacuum:
+            if not isinstance(dest, str):
+                raise SqlTypeParameterError("VACUUM INTO needs a file name, get " + type(dest).__name__)
+            with self.__source() as connection:
+                # VACUUM INTO only reads this database but is refused by a query_only reader
+                reader = connection is not self.base
+                if reader:
+                    connection.execute("PRAGMA query_only=0")
+                try:
+                    connection.execute("VACUUM INTO ?", (dest,))
+                finally:
+                    if reader:
+                        connection.execute("PRAGMA query_only=1")
+        else:
+            if isinstance(dest, SQLDatabase):
+                with dest.writer(), self.__source() as connection:
+                    connection.backup(dest.base, pages=pages_per_step, progress=progress, sleep=sleep)
+                    dest.invalidate()
+            elif isinstance(dest, sqlite3.Connection):
+                with self.__source() as connection:
+                    connection.backup(dest, pages=pages_per_step, progress=progress, sleep=sleep)
+            else:
+                target = sqlite3.connect(dest)
+                try:
+                    with self.__source() as connection:
+                        connection.backup(target, pages=pages_per_step, progress=progress, sleep=sleep)
+                finally:
+                    target.close()
+
+        self.SQLdblog.info(functionName="backup", message="Database '%s' saved into %s",
+                           args=(self.databaseName, getattr(dest, 'databaseName', dest)))
+
+    def snapshot(self, **kwargs):
+        """
+        Restore the committed content of the database into a new ':memory:' database (fast read replica)
+
+        :param kwargs: parameters of SQLDatabase (statementCacheSize, profile, ...)
+        :return: SQLDatabase
+        """
+        replica = SQLDatabase(':memory:', **kwargs)
+        self.backup(replica, pages_per_step=-1, sleep=0)
+        return replica
+
+    @contextmanager
+    def __source(self):
+        """
+        Implicit function: connection read by a backup => a reader in pooled mode, the writer otherwise
+
+        :return: sqlite3 connection
+        """
+        if not self.readers or getattr(self.local, 'depth', 0):
+            with self.writer() as cursor:
+                if self.base.in_transaction:
+                    # The backup would wait forever for the lock held by its own source connection
+                    self.SQLdblog.error(functionName="backup", message="Commit pending changes before a backup")
+                    raise sqlite3.OperationalError("Cannot backup the database while its connection has "
+                                                   "uncommitted changes: commit first")
+                yield cursor.connection
+        else:
+            with self.reader() as cursor:
+                yield cursor.connection
 
     def close(self):
         """
@@ -45,7 +581,39 @@ class SQLDatabase:
         """
         self.SQLdblog.debug(functionName="close",
                             message="Close Database")
-        self.base.close()
+        with self.writer():
+            # Pending changes of the group-commit policy are committed, nothing is left to do on exit
+            if self.groupCommit is not None:
+                self.commit()
+                self.groupCommit = None
+            # Every connection is closed, even a reader still checked out by an iterator (no wait on the pool)
+            for connection in self.connections:
+                connection.close()
+
+    def attach(self, databaseName):
+        """
+        Attach another database file to the writer connection (once) => SQLTable.copy_to / SQLTable.move_to
+        ATTACH is not allowed inside a transaction: commit before the first access to a new file.
+
+        :param databaseName: DB file
+        :return: schema name of the attached database
+        """
+        with self.writer() as cursor:
+            schema = self.attached.get(databaseName)
+            if schema is None:
+                if databaseName == ':memory:':
+                    self.SQLdblog.error(functionName="attach", message="A ':memory:' database cannot be attached")
+                    raise SqlAttachError("A ':memory:' database cannot be attached to another connection: "
+                                         "copy / move between tables of the same SQLDatabase object only")
+                schema = "attached_" + str(len(self.attached))
+                try:
+                    cursor.execute("ATTACH DATABASE ? AS " + schema, (databaseName,))
+                except sqlite3.OperationalError:
+                    self.SQLdblog.error(functionName="attach",
+                                        message="Can't attach '" + databaseName + "': commit pending changes first")
+                    raise
+                self.attached[databaseName] = schema
+            return schema
 
     def list_table(self):
         """
@@ -53,14 +621,68 @@ class SQLDatabase:
 
         :return: list of table name
         """
-        self.cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
-        return [idx[0] for idx in self.cursor.fetchall()]
+        with self.reader() as cursor:
+            cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
+            return [idx[0] for idx in cursor.fetchall() if FULLTEXT_SUFFIX not in idx[0]]
+
+    def __metadata(self):
+        """
+        Implicit function reading the info of every table in ONE query (sqlite_master x pragma_table_info),
+        memoized until PRAGMA schema_version changes
+
+        :return: (schema_version, {table name: (rows of PRAGMA table_info, columns of its FTS5 table)})
+        """
+        with self.writer() as cursor:
+            cursor.execute("PRAGMA schema_version")
+            version = cursor.fetchone()[0]
+            if self.metadata is None or self.metadata[0] != version:
+                cursor.execute("SELECT m.name, p.cid, p.name, p.type, p.\"notnull\", p.dflt_value, p.pk "
+                               "FROM sqlite_master AS m, pragma_table_info(m.name) AS p "
+                               "WHERE m.type='table' ORDER BY m.name, p.cid")
+                info = {}
+                for row in cursor.fetchall():
+                    info.setdefault(row[0], []).append(row[1:])
+                self.metadata = (version, {name: (rows, [idx[1] for idx in info.get(name + FULLTEXT_SUFFIX, [])])
+                                           for name, rows in info.items() if FULLTEXT_SUFFIX not in name})
+            return self.metadata
+
+    def tables(self):
+        """
+        List the tables of the database from the memoized metadata => see SQLDatabase.open_table
+
+        :return: list of table name
+        """
+        return list(self.__metadata()[1])
+
+    def open_table(self, name):
+        """
+        SQLTable of an existing table, created on first access from the metadata read for every table at once
+        (no CREATE TABLE attempt) and memoized => the same object is returned (filters defined are kept)
+
+        :param name: table name
+        :return: SQLTable
+        """
+        version, tables = self.__metadata()
+        table = self.tableCache.get(name)
+        if table is None or table.schemaVersion != version:
+            if name not in tables:
+                self.SQLdblog.error(functionName="open_table", message="Table '" + name + "' doesn't exist in the database...")
+                raise SqlTableUnknown("Table '" + name + "' does not exist in the database")
+            if table is None:
+                table = self.tableCache[name] = SQLTable.from_metadata(self, name, version, *tables[name])
+            else:
+                table.schema()                                           # Schema changed: refresh its metadata
+        return table
 
     def drop(self, table: str):
         try:
-            if table not in self.list_table():
-                raise SqlTableUnknown("Table does not exist in the database")
-            self.cursor.execute("DROP TABLE " + table)
+            with self.writer() as cursor:
+                if table not in self.list_table():
+                    raise SqlTableUnknown("Table does not exist in the database")
+                cursor.execute("DROP TABLE " + table)
+                cursor.execute("DROP TABLE IF EXISTS " + table + FULLTEXT_SUFFIX)
+                self.invalidate(table)
+                self.tableCache.pop(table, None)
             self.SQLdblog.debug(functionName="drop",
                                 message="Table '" + table + "' has been removed from database.")
         except SqlTableUnknown:
@@ -92,12 +714,7 @@ class SQLTable(object):
         :param tableName: table name
         :param kwargs: <param_name1>='<param_type1>', <param_name2>='<param_type2>', ...
         """
-        self.db           = SQLdbObj                                     # related database object
-        self.tableName    = tableName                                    # Name of the table
-        self.dataType     = []                                           #
-        self.filterKey    = []
-
-        self.SQLtablelog = Logger(name='SQLTable', severity=logging.INFO)
+        self.__setup(SQLdbObj, tableName)
 
         # Dynamically create the defined table if not ALREADY defined.
         try:
@@ -109,6 +726,7 @@ class SQLTable(object):
             self.tablePrimVar = {k: v for k, v in kwargs.items()
                                  if 'primary key'.lower() in v.lower()}  # Extract Primary parameter of the table
             self.tableLen = len(self.tableVar)                           # Number of parameter in the table
+            self.__load_schema(declared=True)                            # Cache metadata of the table
 
             self.SQLtablelog.info(functionName="__init__",  # str(inspect.stack()[-5][3]),
                                   message="Table '" + self.tableName + "' created")
@@ -120,16 +738,48 @@ class SQLTable(object):
 
         # Extract info from existing table in the database (parameters, Primary parameter, length, ...)
         except sqlite3.OperationalError:
-            query_result = self.query_info()                             # Query the database about the table
-
-            self.tableVar = {idx[1]: idx[2] for idx in query_result}     # Update parameters of the table
-            self.tablePrimVar = {idx[1]: idx[2] for idx in query_result
-                                 if idx[-1] == 1}                        # Update Primary parameter of the table
-            self.tableLen = len(self.tableVar)                           # Update Number of parameter in the table
+            self.__load_schema()                                         # Query the database about the table
 
             self.SQLtablelog.debug(functionName="__init__",
                                    message="Table '" + self.tableName + "' already exists : Info extracted.")
 
+    @classmethod
+    def from_metadata(cls, SQLdbObj, tableName, schemaVersion, tableInfo, fulltextKey):
+        """
+        Wrap an existing table from metadata already read (no CREATE TABLE attempt, no query) => SQLDatabase.open_table
+
+        :param SQLdbObj: database name object
+        :param tableName: table name
+        :param schemaVersion: PRAGMA schema_version when the metadata was read
+        :param tableInfo: rows of PRAGMA table_info of the table
+        :param fulltextKey: columns of the FTS5 table of the table
+        :return: SQLTable
+        """
+        table = cls.__new__(cls)
+        table.__setup(SQLdbObj, tableName)
+        table.__apply_schema(schemaVersion, tableInfo, fulltextKey)
+        return table
+
+    def __setup(self, SQLdbObj, tableName):
+        """
+        Implicit function to initialize the attributes of the table object
+
+        :return: None
+        """
+        self.db           = SQLdbObj                                     # related database object
+        self.tableName    = tableName                                    # Name of the table
+        self.dataType     = []                                           #
+        self.filterKey    = []
+        self.uniqueFilter = False                                        # Filter enforced by UNIQUE indexes
+        self.normalizedKey = []                                          # Keys with an indexed normalized column
+        self.fulltextKey  = []                                           # Keys indexed in the FTS5 table
+        self.statementCache = StatementCache(maxSize=SQLdbObj.statementCacheSize)   # SQL text by operation shape
+        self.resultCache  = None                                         # => enable_result_cache
+        self.indexedColumns = set()                                      # First column of each index => page
+        self.indexedVersion = None                                       # schemaVersion of indexedColumns
+
+        self.SQLtablelog = Logger(name='SQLTable', severity=logging.INFO)
+
     def __create_table(self, tableVar):
         """
         Implicit function to create table => called in the __init__ function
@@ -137,34 +787,147 @@ class SQLTable(object):
         :param tableVar: dictionary of {param_name : param_type}
         :return: None
         """
-        # Merge every parameters of the Table in a list: ["name1 type1", "name2 type2", ...]
-        for key, val in tableVar.items():
-            self.dataType.append(key + " " + val)
-        # Create Table
-        self.db.cursor.execute("CREATE TABLE " + self.tableName + '(' + ", ".join(self.dataType) + ")")
+        with self.db.writer():
+            # Merge every parameters of the Table in a list: ["name1 type1", "name2 type2", ...]
+            for key, val in tableVar.items():
+                self.dataType.append(key + " " + val)
+            # Create Table
+            self.db.cursor.execute("CREATE TABLE " + self.tableName + '(' + ", ".join(self.dataType) + ")")
+
+    def __load_schema(self, declared=False):
+        """
+        Implicit function to (re)load the metadata of the table, cached on the table object:
+        parameters, Primary parameter, length, column index map, normalized & fulltext keys.
+        Refreshed only when PRAGMA schema_version changes => see SQLTable.schema
 
+        :param declared: True to keep parameters declared at the creation of the table (tableVar, tablePrimVar)
+        :return: None
+        """
+        with self.db.writer():
+            self.db.cursor.execute("PRAGMA schema_version")
+            schemaVersion = self.db.cursor.fetchone()[0]
+            query_result = self.query_info()                             # Query the database about the table
+            self.db.cursor.execute("PRAGMA table_info(" + self.tableName + FULLTEXT_SUFFIX + ")")
+            self.__apply_schema(schemaVersion, query_result, [idx[1] for idx in self.db.cursor.fetchall()], declared)
+
+    def __apply_schema(self, schemaVersion, query_result, fulltextKey, declared=False):
+        """
+        Implicit function to cache the metadata read by __load_schema (or SQLDatabase.open_table)
+
+        :param schemaVersion: PRAGMA schema_version
+        :param query_result: rows of PRAGMA table_info of the table
+        :param fulltextKey: columns of the FTS5 table of the table
+        :param declared: True to keep parameters declared at the creation of the table (tableVar, tablePrimVar)
+        :return: None
+        """
+        self.schemaVersion = schemaVersion
+        self.statementCache.clear()                                      # Columns may have changed
+
+        if not query_result:
+            raise SqlTableUnknown("Table '" + self.tableName + "' does not exist in the database")
+        shadow = [idx[1] for idx in query_result if idx[1].endswith(NORMALIZED_SUFFIX)]
+        # Shadow columns are hidden: position of the parameters as returned by select_one / select_all
+        self.tableInfo = [(pos,) + tuple(idx[1:]) for pos, idx in
+                          enumerate([idx for idx in query_result if idx[1] not in shadow])]
+
+        if not declared:
+            self.tableVar = {idx[1]: idx[2] for idx in self.tableInfo}   # Update parameters of the table
+            self.tablePrimVar = {idx[1]: idx[2] for idx in self.tableInfo
+                                 if idx[-1] == 1}                        # Update Primary parameter of the table
+            self.tableLen = len(self.tableVar)                           # Update Number of parameter in the table
+        self.columnIndex = {idx[1]: idx[0] for idx in self.tableInfo}
+        self.converters = compile_converters(self.tableVar)              # Type converter of each parameter
+
+        self.normalizedKey = [key[:-len(NORMALIZED_SUFFIX)] for key in shadow
+                              if key[:-len(NORMALIZED_SUFFIX)] in self.tableVar]
+        self.fulltextKey = list(fulltextKey)
+
+    @instrumented
+    def schema(self):
+        """
+        Metadata of the table, cached on the table object.
+        Only PRAGMA schema_version is queried: table info is re-read only if the schema changed (even externally).
+
+        :return: dictionary {'columns': [...], 'types': {...}, 'primary': [...], 'index': {...}}
+        """
+        with self.db.writer():
+            self.db.cursor.execute("PRAGMA schema_version")
+            if self.db.cursor.fetchone()[0] != self.schemaVersion:
+                self.__load_schema()
+                self.SQLtablelog.debug(functionName="schema",
+                                       message="Schema of table '" + self.tableName + "' has changed : Info extracted.")
+
+            return {'columns': list(self.tableVar.keys()),
+                    'types': dict(self.tableVar),
+                    'primary': list(self.tablePrimVar.keys()),
+                    'index': dict(self.columnIndex)}
+
+    def enable_result_cache(self, maxSize=256, ttl=None):
+        """
+        Opt-in: cache the results of select_one / select_all.
+        Results are invalidated by every insert/modify/delete/drop done through the wrapper, by commits, rollbacks
+        and by commits of other connections (PRAGMA data_version). Writes done with raw SQL on
+        SQLDatabase.cursor are NOT seen => call SQLDatabase.invalidate.
+
+        :param maxSize: maximum number of results kept, 0 to disable the cache
+        :param ttl: time-to-live of a result in seconds, None for no expiration
+        :return: None
+        """
+        self.resultCache = ResultCache(maxSize=maxSize, ttl=ttl) if maxSize else None
+
+    def result_stats(self):
+        """
+        Statistics of the result cache of the table
+
+        :return: dictionary {'hits': ..., 'misses': ..., 'size': ..., 'maxSize': ..., 'ttl': ...} or None if disabled
+        """
+        return None if self.resultCache is None else self.resultCache.stats()
+
+    def statement_stats(self):
+        """
+        Statistics of the statement cache of the table
+
+        :return: dictionary {'hits': ..., 'misses': ..., 'size': ..., 'maxSize': ...}
+        """
+        return self.statementCache.stats()
+
+    @instrumented
     def query_info(self):
         """
         Query the database to analyse if table already exists.
 
         :return: Table info (parameters, ...)
         """
-        self.db.cursor.execute("PRAGMA table_info(" + self.tableName + ")")
-        return self.db.cursor.fetchall()
+        with self.db.reader() as cursor:
+            cursor.execute("PRAGMA table_info(" + self.tableName + ")")
+            return cursor.fetchall()
 
-    def define_filter_for_insertion(self, filterKeys: list):
+    @instrumented
+    def define_filter_for_insertion(self, filterKeys: list, unique=False, auth=False, normalized=True):
         """
         Define a list of parameter that will be used during insertion to check if data already exists in table
         !!!! Must be called before insert, otherwise, no filter will be applied !!!!
 
+        unique=True: uniqueness is enforced by the database with UNIQUE indexes instead of scanning the table,
+        insert uses INSERT ... ON CONFLICT DO NOTHING and raises SqlDoubleItemsOccurs if nothing was inserted.
+        Redefining the filter drops the UNIQUE indexes of the previous definition.
+        Items are compared on their whole (normalized) value instead of the substring research of select_one.
+
         :param filterKeys: List of parameter to filter
+        :param unique: True to back the filter with UNIQUE indexes
+        :param auth: same meaning as SQLTable.insert => True: one UNIQUE index on ALL filter keys,
+                     False: one UNIQUE index per filter key
+        :param normalized: True to compare noaccent() values (accent/case insensitive), False for raw values
         :return: None
         """
         # check if all filter are in the parameter of the table
+        self.uniqueFilter = False
         try:
             for key in filterKeys:
                 if key not in self.tableVar.keys():
                     raise InsertionKeyNotFoundError(str(filterKeys) + "' parameters not found in " + str(list(self.tableVar.keys())))
+            self.__define_unique_indexes(filterKeys if unique else [], auth, normalized)
+            self.uniqueFilter = bool(unique and filterKeys)
             self.SQLtablelog.debug(functionName="define_filter_for_insertion",
                                    message="'" + str(filterKeys) + "' parameters will be used for filtering")
         except InsertionKeyNotFoundError:
@@ -174,6 +937,232 @@ class SQLTable(object):
         finally:
             self.filterKey = filterKeys
 
+    def __define_unique_indexes(self, filterKeys, auth, normalized):
+        """
+        Implicit function to create the UNIQUE indexes of the filter => called in define_filter_for_insertion
+        UNIQUE indexes created by this function for a previous filter are dropped.
+
+        :param filterKeys: List of parameter to filter, empty to drop every UNIQUE index of the filter
+        :param auth: True: one index on all the keys, False: one index per key
+        :param normalized: True to index noaccent() values
+        :return: None
+        """
+        prefix = self.tableName + "__unique_"
+        groups = [filterKeys] if auth and filterKeys else [[key] for key in filterKeys]
+        names = [prefix + ("" if normalized else "raw_") + "_".join(keys) for keys in groups]
+        with self.db.writer() as cursor:
+            cursor.execute("SELECT name FROM sqlite_master WHERE type='index' AND tbl_name=? AND substr(name, 1, ?)=?",
+                           (self.tableName, len(prefix), prefix))
+            for name, in cursor.fetchall():
+                if name not in names:
+                    cursor.execute("DROP INDEX " + name)
+
+            for name, keys in zip(names, groups):
+                columns = ", ".join(["noaccent(" + key + ")" if normalized else key for key in keys])
+                try:
+                    cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS " + name + " ON " + self.tableName +
+                                   "(" + columns + ")")
+                except sqlite3.IntegrityError:
+                    self.SQLtablelog.error(functionName="define_filter_for_insertion",
+                                           message="Table '" + self.tableName + "' already contains double items for " +
+                                                   str(keys))
+                    raise SqlDoubleItemsOccurs("Unique index cannot be created: table '" + self.tableName +
+                                               "' already contains double items for " + str(keys))
+
+    @instrumented
+    def define_normalized_keys(self, normalizedKeys: list):
+        """
+        Opt-in: keep an indexed shadow column '<key>__noaccent' = noaccent(<key>) for every given parameter.
+        Shadow columns are maintained by triggers, so exact & prefix research (matchMode='exact'/'prefix')
+        and duplicate check during insertion become index lookups instead of full scans.
+        Substring research (matchMode='contains') is still available and unchanged.
+
+        :param normalizedKeys: List of parameter to normalize & index
+        :return: None
+        """
+        with self.db.writer():
+            try:
+                for key in normalizedKeys:
+                    if key not in self.tableVar.keys():
+                        raise InsertionKeyNotFoundError(str(normalizedKeys) + "' parameters not found in " + str(list(self.tableVar.keys())))
+
+                for key in normalizedKeys:
+                    if key in self.normalizedKey:
+                        continue
+                    shadow = key + NORMALIZED_SUFFIX
+                    trigger = self.tableName + "_" + shadow
+                    self.db.cursor.execute("ALTER TABLE " + self.tableName + " ADD COLUMN " + shadow + " TEXT")
+                    self.db.cursor.execute("UPDATE " + self.tableName + " SET " + shadow + "=noaccent(" + key + ")")
+                    self.db.cursor.execute("CREATE TRIGGER " + trigger + "_insert AFTER INSERT ON " + self.tableName +
+                                           " BEGIN UPDATE " + self.tableName + " SET " + shadow + "=noaccent(NEW." + key + ")" +
+                                           " WHERE rowid=NEW.rowid; END")
+                    self.db.cursor.execute("CREATE TRIGGER " + trigger + "_update AFTER UPDATE OF " + key +
+                                           " ON " + self.tableName +
+                                           " BEGIN UPDATE " + self.tableName + " SET " + shadow + "=noaccent(NEW." + key + ")" +
+                                           " WHERE rowid=NEW.rowid; END")
+                    self.db.cursor.execute("CREATE INDEX " + trigger + "_index ON " + self.tableName + "(" + shadow + ")")
+                    self.normalizedKey.append(key)
+                self.__load_schema()
+
+                self.SQLtablelog.debug(functionName="define_normalized_keys",
+                                       message="'" + str(normalizedKeys) + "' parameters are normalized & indexed")
+            except InsertionKeyNotFoundError as e:
+                self.SQLtablelog.error(functionName="define_normalized_keys", message=e.args[0])
+                raise
+
+    @instrumented
+    def define_fulltext_keys(self, fulltextKeys: list):
+        """
+        Opt-in: keep an external-content FTS5 index '<table>__fts' over the given TEXT parameters.
+        The index is kept in sync by triggers and folds case & accents (unicode61 remove_diacritics),
+        so word research (matchMode='words') becomes a MATCH query instead of one noaccent() call per row & word.
+
+        :param fulltextKeys: List of parameter to index (replace the previous definition)
+        :return: None
+        """
+        with self.db.writer():
+            try:
+                for key in fulltextKeys:
+                    if key not in self.tableVar.keys():
+                        raise InsertionKeyNotFoundError(str(fulltextKeys) + "' parameters not found in " + str(list(self.tableVar.keys())))
+
+                if list(fulltextKeys) == self.fulltextKey:
+                    return
+
+                fts = self.tableName + FULLTEXT_SUFFIX
+                columns = ", ".join(fulltextKeys)
+                new = ", ".join(["NEW." + key for key in fulltextKeys])
+                old = ", ".join(["OLD." + key for key in fulltextKeys])
+
+                # Previous definition is replaced
+                self.db.cursor.execute("DROP TABLE IF EXISTS " + fts)
+                for trigger in ("_insert", "_delete", "_update"):
+                    self.db.cursor.execute("DROP TRIGGER IF EXISTS " + fts + trigger)
+
+                if fulltextKeys:
+                    self.db.cursor.execute("CREATE VIRTUAL TABLE " + fts + " USING fts5(" + columns + ", content='" +
+                                           self.tableName + "', content_rowid='rowid', " +
+                                           "tokenize='unicode61 remove_diacritics 2')")
+                    self.db.cursor.execute("CREATE TRIGGER " + fts + "_insert AFTER INSERT ON " + self.tableName +
+                                           " BEGIN INSERT INTO " + fts + "(rowid, " + columns + ")" +
+                                           " VALUES(NEW.rowid, " + new + "); END")
+                    self.db.cursor.execute("CREATE TRIGGER " + fts + "_delete AFTER DELETE ON " + self.tableName +
+                                           " BEGIN INSERT INTO " + fts + "(" + fts + ", rowid, " + columns + ")" +
+                                           " VALUES('delete', OLD.rowid, " + old + "); END")
+                    self.db.cursor.execute("CREATE TRIGGER " + fts + "_update AFTER UPDATE OF " + columns +
+                                           " ON " + self.tableName +
+                                           " BEGIN INSERT INTO " + fts + "(" + fts + ", rowid, " + columns + ")" +
+                                           " VALUES('delete', OLD.rowid, " + old + ");" +
+                                           " INSERT INTO " + fts + "(rowid, " + columns + ")" +
+                                           " VALUES(NEW.rowid, " + new + "); END")
+                    self.db.cursor.execute("INSERT INTO " + fts + "(" + fts + ") VALUES('rebuild')")
+                self.__load_schema()
+
+                self.SQLtablelog.debug(functionName="define_fulltext_keys",
+                                       message="'" + str(fulltextKeys) + "' parameters are indexed in " + fts)
+            except InsertionKeyNotFoundError as e:
+                self.SQLtablelog.error(functionName="define_fulltext_keys", message=e.args[0])
+                raise
+
+    def __check_columns(self, columns, functionName, rowid=False):
+        """
+        Implicit function to check that every parameter exists in the table => SqlNameParameterError otherwise
+
+        :param columns: list of parameters
+        :param functionName: name of the calling function (log)
+        :param rowid: True to accept 'rowid' as parameter
+        :return: None
+        """
+        for key in columns:
+            if key not in self.tableVar and not (rowid and key == 'rowid'):
+                self.SQLtablelog.error(functionName=functionName,
+                                       message="The following parameter does not exist in the reference: " + str(key))
+                raise SqlNameParameterError("This parameter does not exist in the SQL table " + str(key))
+
+    def __normalized_column(self, key):
+        """
+        SQL expression of the normalized value of a parameter: indexed shadow column if defined, noaccent() otherwise
+
+        :param key: parameter name
+        :return: SQL expression
+        """
+        if key in self.normalizedKey:
+            return key + NORMALIZED_SUFFIX
+        return "noaccent(" + key + ")"
+
+    def __build_filter(self, inclusion, matchMode, kwargs):
+        """
+        Implicit function to build the shape & values of the WHERE clause of select_one / delete
+
+            - 'contains': every word of the value must be included in the parameter (full scan)
+            - 'exact'   : normalized parameter equals the normalized value (index lookup if normalized key)
+            - 'equal'   : parameter strictly equals the value, no normalization (index lookup if indexed: primary key)
+            - 'prefix'  : normalized parameter starts with the normalized value (index range if normalized key)
+            - 'words'   : every word of the value must start a word of the parameter (FTS5 MATCH if fulltext key),
+                          falls back on 'contains' for the parameters without FTS5 index
+
+        :param inclusion: combinational logic between filter
+        :param matchMode: 'contains', 'exact', 'equal', 'prefix' or 'words'
+        :param kwargs: pattern research
+        :return: (shape of the WHERE clause => see __filter_clause, tuple of values)
+        """
+        shape = []
+        filterval = []
+        for key, value in kwargs.items():
+            if matchMode == 'words' and key in self.fulltextKey and str(value).strip(' '):
+                words = [i for i in str(value).split(' ') if i]
+                shape.append(('match', key))
+                filterval.append(key + " : (" + " AND ".join(['"' + i.replace('"', '""') + '"*' for i in words]) + ")")
+            elif matchMode in ('contains', 'words'):
+                words = str(value).split(' ')
+                shape.append(('contains', key, len(words)))
+                filterval += [noaccent(i) for i in words]
+            elif matchMode == 'exact':
+                shape.append(('exact', key))
+                filterval.append(noaccent(value))
+            elif matchMode == 'equal':
+                shape.append(('equal', key))
+                filterval.append(value)
+            elif matchMode == 'prefix':
+                value = noaccent(value)
+                if value:
+                    # Range on the normalized value: [value, value with its last character incremented[
+                    shape.append(('prefix', key))
+                    filterval += [value, value[:-1] + chr(ord(value[-1]) + 1)]
+                else:
+                    shape.append(('any', key))
+                    filterval.append(value)
+            else:
+                raise ValueError(str(matchMode) + " is an Unknown match mode: 'contains', 'exact', 'equal', 'prefix' or 'words' expected")
+        return (inclusion,) + tuple(shape), tuple(filterval)
+
+    def __filter_clause(self, shape):
+        """
+        Implicit function to build the WHERE clause from its shape => only called on statement cache miss
+
+        :param shape: (inclusion, (kind, key, ...), ...) as returned by __build_filter
+        :return: WHERE clause
+        """
+        filterkey = []
+        for item in shape[1:]:
+            kind, key = item[0], item[1]
+            column = self.__normalized_column(key)
+            if kind == 'match':
+                fts = self.tableName + FULLTEXT_SUFFIX
+                filterkey.append("rowid IN (SELECT rowid FROM " + fts + " WHERE " + fts + " MATCH ?)")
+            elif kind == 'contains':
+                filterkey += ["instr(noaccent(" + key + "), ?)>0"] * item[2]
+            elif kind == 'exact':
+                filterkey.append(column + "=?")
+            elif kind == 'equal':
+                filterkey.append(key + "=?")
+            elif kind == 'prefix':
+                filterkey.append("(" + column + ">=? AND " + column + "<?)")
+            else:
+                filterkey.append(column + ">=?")
+        return shape[0].join(filterkey)
+
+    @instrumented
     def insert(self, auth=False, **kwargs):
         """
         Insert element into the associated table
@@ -182,51 +1171,407 @@ class SQLTable(object):
         :param kwargs: Dictionary of parameter => defined by SQLTable object
         :return: None
         """
+        with self.db.writer():
+            try:
+                # Check & Compare the characteristics of the parameters
+                ''' # -> Table parameters (number, type) have already been defined during table creation
+                    #    This function checks that SQLTable.insert 'kwargs param' are inline with the table param
+                    #       - ref_param = parameters @ creation of the table
+                    #       - test_param = parameters @ call of insert function
+                '''
+                check_param_char(ref_param=self.tableVar, test_param=kwargs, converters=self.converters)
+
+                # Select the filter parameters (thanks to SQLTable.define_filter_for_insertion function)
+                param = {k: v for k, v in kwargs.items() if k in self.filterKey}
+
+                # Filter key MUST NOT be empty for insertion ...
+                for k, v in param.items():
+                    if v == '':
+                        raise SqlFilterKeyEmptyError("Parameter '" + str(k) + "' is empty")
+
+                # Check filtered parameter does NOT exist in table => done by the UNIQUE indexes if defined,
+                # index lookup if every filter key is normalized, full scan otherwise
+                if not self.uniqueFilter:
+                    if param and all(key in self.normalizedKey for key in param):
+                        table = self.select_one(inclusion=" AND " if auth else " OR ", matchMode='exact', **param)
+                    else:
+                        table = self.select_one(**param)
+
+                    check_for_double_items(param=param, table=table, query_info=self.tableInfo, auth=auth)
+
+                if self.SQLtablelog.isEnabledFor(logging.INFO):
+                    self.SQLtablelog.info(functionName="insert", message="INSERT in %s: %s",
+                                          args=(self.tableName, " | ".join([str(k) + "=" + str(v) for k, v in kwargs.items()])))
+
+                # 'id' parameter should be automatically incremented, So don't need to insert it if present
+                if 'id' in kwargs.keys():
+                    kwargs.pop('id')
+                    table_len_final = self.tableLen - 1
+                else:
+                    table_len_final = self.tableLen
+
+                columns = tuple(kwargs.keys())
+                conflict = " ON CONFLICT DO NOTHING" if self.uniqueFilter else ""
+                query = self.statementCache.get(('insert', columns, table_len_final, conflict),
+                                                lambda: "INSERT INTO " + self.tableName + '(' + ",".join(columns) + ") " +
+                                                        "VALUES(" + ','.join(["?"] * table_len_final) + ")" + conflict)
+                try:
+                    self.db.cursor.execute(query, tuple(kwargs.values()))
+                except sqlite3.IntegrityError as e:
+                    # Constraint not covered by the filter (ex: primary key)
+                    raise SqlDoubleItemsOccurs("Item already exist in the database: " + e.args[0])
+                self.db.written(self.tableName, self.db.cursor.rowcount)
+                if self.uniqueFilter and self.db.cursor.rowcount == 0:
+                    raise SqlDoubleItemsOccurs("Item already exist in the database")
+
+            except (SqlFilterKeyEmptyError, SqlLengthParameterError, SqlNameParameterError, SqlTypeParameterError, SqlDoubleItemsOccurs) as e:
+                self.SQLtablelog.error(functionName="insert", message=e.args[0])
+                raise
+
+            except sqlite3.OperationalError:
+                self.SQLtablelog.error(functionName="insert", message="Please, check the definition of the table you try to access, " +
+                                                                      "parameter definition does not reach expectations")
+                self.schema()                                            # Table may have been modified externally
+
+    @instrumented
+    def insert_many(self, rows, auth=False, chunkSize=500):
+        """
+        Insert a batch of elements into the associated table
+
+            - Rows are validated per chunk (length, name, type) without creating one logger per value
+            - Filter keys (SQLTable.define_filter_for_insertion) are checked with ONE set-based query per chunk,
+              against the table AND against the rows already accepted in the batch. Normalized values of the
+              table are staged once per call in an indexed temporary table (see __stage_normalized_keys)
+            - Accepted rows are written with executemany, every chunk inside the same transaction
+
+        :param rows: iterable of dict {param_name: value} or of tuple ordered as the table parameters
+        :param auth: same meaning as SQLTable.insert => True: ALL filter keys must match to reject an item
+        :param chunkSize: number of rows validated & written per statement
+        :return: (number of rows inserted, list of (row index, reason) of rejected rows)
+        """
+        with self.db.writer():
+            # 'id' parameter should be automatically incremented, So don't need to insert it if present
+            columns = tuple(key for key in self.tableVar.keys() if key != 'id')
+            query = self.statementCache.get(('insert', columns, len(columns)),
+                                            lambda: "INSERT INTO " + self.tableName + '(' + ",".join(columns) + ") " +
+                                                    "VALUES(" + ','.join(["?"] * len(columns)) + ")")
+
+            inserted = 0
+            rejected = []
+            seen = set()                                                 # Normalized filter values of the batch
+            rows = enumerate(rows)
+
+            try:
+                with self.db.savepoint("insert_many") as cursor:
+                    # Existing items of the table => index lookups for every chunk
+                    staged = None
+                    if self.filterKey and not self.uniqueFilter:
+                        staged = self.__stage_normalized_keys(cursor, self.tableName, auth)
+
+                    chunk = list(islice(rows, chunkSize))
+                    while chunk:
+                        #############################################################################################
+                        # Check & Compare the characteristics of the parameters for the whole chunk
+                        valid, chunk_rejected = check_batch_char(ref_param=self.tableVar, rows=chunk, converters=self.converters)
+                        rejected += chunk_rejected
+
+                        #############################################################################################
+                        # Filter key MUST NOT be empty & MUST NOT exist in the table (or earlier in the batch)
+                        valid, chunk_rejected = self.__filter_double_items(valid, seen, auth, staged)
+                        rejected += chunk_rejected
+
+                        #############################################################################################
+                        # Write the chunk
+                        values = [tuple(row[key] for key in columns) for idx, row in valid]
+                        self.db.cursor.execute("SAVEPOINT insert_many_chunk")
+                        try:
+                            self.db.cursor.executemany(query, values)
+                            inserted += len(values)
+                        except sqlite3.IntegrityError:
+                            # Constraint not covered by the filter (ex: primary key) => isolate the faulty rows
+                            self.db.cursor.execute("ROLLBACK TO insert_many_chunk")
+                            for (idx, row), value in zip(valid, values):
+                                try:
+                                    self.db.cursor.execute(query, value)
+                                    inserted += 1
+                                except sqlite3.IntegrityError as e:
+                                    if self.uniqueFilter and e.args[0].startswith("UNIQUE"):
+                                        rejected.append((idx, "Item already exist in the database"))
+                                    else:
+                                        rejected.append((idx, e.args[0]))
+                        self.db.cursor.execute("RELEASE insert_many_chunk")
+
+                        chunk = list(islice(rows, chunkSize))
+
+                    if staged is not None and staged[0] != self.tableName:
+                        cursor.execute("DROP TABLE " + staged[0])
+                self.db.written(self.tableName, inserted)
+
+            except sqlite3.OperationalError:
+                self.SQLtablelog.error(functionName="insert_many", message="Please, check the definition of the table you try to access, " +
+                                                                           "parameter definition does not reach expectations")
+                raise
+
+            self.SQLtablelog.info(functionName="insert_many", message="INSERT in %s: %d rows inserted | %d rows rejected",
+                                  args=(self.tableName, inserted, len(rejected)))
+            return inserted, rejected
+
+    def __filter_double_items(self, valid, seen, auth, staged):
+        """
+        Implicit function to reject the rows of a chunk whose filter keys already exist
+        => called in the insert_many function
+
+        Comparison is done on normalized values (noaccent) with ONE query per chunk:
+            - auth=False: an item is rejected if ANY filter key already exists
+            - auth=True : an item is rejected if ALL filter keys already exist on the same row
+
+        :param valid: list of (index, converted dict)
+        :param seen: set of normalized filter values already accepted in the batch (updated)
+        :param auth: combinational logic between filter keys
+        :param staged: (table, normalized columns) of the existing items => see __stage_normalized_keys
+        :return: (list of (index, converted dict) accepted, list of (index, reason) rejected)
+        """
+        if not self.filterKey:
+            return valid, []
+
+        accepted = []
+        rejected = []
+        candidates = []
+        for idx, row in valid:
+            empty = [key for key in self.filterKey if row[key] == '']
+            if empty:
+                rejected.append((idx, "Parameter '" + str(empty[0]) + "' is empty"))
+            else:
+                candidates.append((idx, row, self.__normalized_filter(row, auth)))
 
-        try:
-            # Check & Compare the characteristics of the parameters
-            ''' # -> Table parameters (number, type) have already been defined during table creation
-                #    This function checks that SQLTable.insert 'kwargs param' are inline with the table param
-                #       - ref_param = parameters @ creation of the table
-                #       - test_param = parameters @ call of insert function
-            '''
-            check_param_char(ref_param=self.tableVar, test_param=kwargs)
+        # Double items are rejected by the UNIQUE indexes when the chunk is written
+        if not candidates or self.uniqueFilter:
+            return [(idx, row) for idx, row, normalized in candidates], rejected
 
-            # Select the filter parameters (thanks to SQLTable.define_filter_for_insertion function)
-            param = {k: v for k, v in kwargs.items() if k in self.filterKey}
+        #####################################################################################################
+        # Query existing normalized values of the filter keys in one statement
+        filterKey = tuple(self.filterKey)
+        source, columns = staged
+        query = self.statementCache.get(('double_items', source, tuple(columns), auth, len(candidates)),
+                                        lambda: self.__double_items_query(source, columns, auth, len(candidates)))
+        if auth:
+            self.db.cursor.execute(query, tuple(v for c in candidates for v in c[2][0]))
+        else:
+            self.db.cursor.execute(query, tuple(c[2][pos][1] for pos in range(len(filterKey)) for c in candidates))
+        existing = set(self.db.cursor.fetchall())
+
+        for idx, row, normalized in candidates:
+            if any(value in existing or value in seen for value in normalized):
+                rejected.append((idx, "Item already exist in the database"))
+            else:
+                seen.update(normalized)
+                accepted.append((idx, row))
 
-            # Filter key MUST NOT be empty for insertion ...
-            for k, v in param.items():
-                if v == '':
-                    raise SqlFilterKeyEmptyError("Parameter '" + str(k) + "' is empty")
+        return accepted, rejected
 
-            # Check filtered parameter does NOT exist in table
-            table = self.select_one(**param)
+    def __double_items_query(self, source, columns, auth, count):
+        """
+        Implicit function to build the query of __filter_double_items => only called on statement cache miss
 
-            check_for_double_items(param=param, table=table, query_info=self.query_info(), auth=auth)
+        :param source: table of the normalized values => see __stage_normalized_keys
+        :param columns: normalized columns of the filter keys in 'source'
+        :param auth: combinational logic between filter keys
+        :param count: number of candidates in the chunk
+        :return: SQL statement
+        """
+        if auth:
+            # CROSS JOIN keeps the candidates as outer loop => one index lookup per candidate
+            values = ", ".join(["(" + ",".join(["?"] * len(columns)) + ")"] * count)
+            return ("SELECT " + ", ".join(columns) + " FROM (VALUES " + values + ") AS candidate CROSS JOIN " +
+                    source + " WHERE " +
+                    " AND ".join([column + "=candidate.column" + str(pos + 1) for pos, column in enumerate(columns)]))
+
+        queries = []
+        for pos, column in enumerate(columns):
+            queries.append("SELECT " + str(pos) + ", " + column + " FROM " + source +
+                           " WHERE " + column + " IN (" + ",".join(["?"] * count) + ")")
+        return " UNION ALL ".join(queries)
+
+    def __stage_normalized_keys(self, cursor, source, auth):
+        """
+        Implicit function to copy the normalized values of the filter keys of 'source' into an indexed temporary
+        table => duplicate checks are index lookups, and no noaccent() index is stored in the database file.
+        Normalized keys (SQLTable.define_normalized_keys) already have an indexed shadow column: nothing is copied.
+
+        :param cursor: cursor of the writer connection (the temporary table is created on its connection)
+        :param source: table holding the existing items ('schema.table' for an attached database)
+        :param auth: True: one index on all the keys, False: one index per key
+        :return: (table to query, normalized columns of the filter keys) => drop the table if it is not 'source'
+        """
+        if all(key in self.normalizedKey for key in self.filterKey):
+            return source, [key + NORMALIZED_SUFFIX for key in self.filterKey]
+
+        temporary = self.tableName + "__double_items"
+        cursor.execute("DROP TABLE IF EXISTS temp." + temporary)
+        cursor.execute("CREATE TEMP TABLE " + temporary + " AS SELECT " +
+                       ", ".join([self.__normalized_column(key) + " AS " + key for key in self.filterKey]) +
+                       " FROM " + source)
+        for pos, keys in enumerate([self.filterKey] if auth else [[key] for key in self.filterKey]):
+            cursor.execute("CREATE INDEX temp." + temporary + "_" + str(pos) + " ON " + temporary +
+                           "(" + ", ".join(keys) + ")")
+        return "temp." + temporary, list(self.filterKey)
+
+    def __normalized_filter(self, row, auth):
+        """
+        Normalized values of the filter keys of a row, shaped like the rows returned by __filter_double_items query
 
-            self.SQLtablelog.info(functionName="insert",
-                                  message="INSERT in " + str(self.tableName) + ": " +
-                                          " | ".join([str(k) + "=" + str(kwargs[k]) for k in list(kwargs.keys())]))
+        :param row: converted dict
+        :param auth: combinational logic between filter keys
+        :return: list of normalized values
+        """
+        if auth:
+            return [tuple(noaccent(row[key]) for key in self.filterKey)]
+        return [(pos, noaccent(row[key])) for pos, key in enumerate(self.filterKey)]
 
-            # 'id' parameter should be automatically incremented, So don't need to insert it if present
-            if 'id' in kwargs.keys():
-                kwargs.pop('id')
-                table_len_final = self.tableLen - 1
-            else:
-                table_len_final = self.tableLen
+    @instrumented
+    def import_csv(self, path, columns=None, chunkSize=IMPORT_CHUNK_SIZE, auth=False, rejectPath=None, commit=True,
+                   encoding='utf-8', **csvArgs):
+        """
+        Stream a CSV file (first line = header) into the table, chunk by chunk => memory bounded by chunkSize
+
+            - Headers are mapped to the parameters of the table (exact name, then case insensitive),
+              headers unknown are ignored
+            - Values are converted & checked as SQLTable.insert_many (converters of the table)
+            - Each chunk is written by SQLTable.insert_many then committed (except inside SQLDatabase.transaction)
+            - Rejected rows are written in a sidecar CSV file: original fields + '_line' + '_error'
+
+        :param path: CSV file
+        :param columns: dictionary {<header>: <param_name>} overriding the mapping
+        :param chunkSize: number of rows per chunk (and per transaction)
+        :param auth: same meaning as SQLTable.insert
+        :param rejectPath: sidecar file of the rejected rows, <path>.rejects if None (created only if needed)
+        :param commit: commit after each chunk
+        :param encoding: encoding of the file
+        :param csvArgs: parameters of csv.reader (delimiter, quotechar, ...)
+        :return: (number of rows inserted, number of rows rejected)
+        """
+        rejects = RejectFile(rejectPath or path + REJECT_SUFFIX, csvFormat=True, encoding=encoding)
+
+        def records():
+            with open(path, newline='', encoding=encoding) as source:
+                reader = csv.reader(source, **csvArgs)
+                header = next(reader, None)
+                if header is None:
+                    return
+                rejects.header = header
+                mapping = [self.__map_header(key, columns) for key in header]
+                missing = [key for key in self.tableVar if key != 'id' and key not in mapping]
+                if missing:
+                    self.SQLtablelog.error(functionName="import_csv",
+                                           message="Parameters missing in the header: " + str(missing))
+                    raise SqlNameParameterError("Parameters missing in the header of " + str(path) + ": " + str(missing))
+
+                for fields in reader:
+                    if len(fields) != len(header):
+                        yield reader.line_num, fields, "Expected %d fields, got %d" % (len(header), len(fields))
+                    else:
+                        yield reader.line_num, fields, {key: val for key, val in zip(mapping, fields) if key}
+
+        return self.__import(records(), rejects, chunkSize, auth, commit)
+
+    @instrumented
+    def import_jsonl(self, path, columns=None, chunkSize=IMPORT_CHUNK_SIZE, auth=False, rejectPath=None, commit=True,
+                     encoding='utf-8'):
+        """
+        Stream a JSON Lines file (one object per line) into the table, chunk by chunk => see SQLTable.import_csv
+
+        Rejected rows are written in a sidecar JSONL file: {"line": ..., "error": ..., "record": <original line>}
+
+        :param path: JSONL file
+        :param columns: dictionary {<key>: <param_name>} overriding the mapping
+        :param chunkSize: number of rows per chunk (and per transaction)
+        :param auth: same meaning as SQLTable.insert
+        :param rejectPath: sidecar file of the rejected rows, <path>.rejects if None (created only if needed)
+        :param commit: commit after each chunk
+        :param encoding: encoding of the file
+        :return: (number of rows inserted, number of rows rejected)
+        """
+        rejects = RejectFile(rejectPath or path + REJECT_SUFFIX, csvFormat=False, encoding=encoding)
+
+        def records():
+            mapping = {}
+            with open(path, encoding=encoding) as source:
+                for line, text in enumerate(source, start=1):
+                    if not text.strip():
+                        continue
+                    try:
+                        record = json.loads(text)
+                    except ValueError as e:
+                        yield line, text.rstrip('\n'), "Invalid JSON: " + str(e)
+                        continue
+                    if not isinstance(record, dict):
+                        yield line, record, "JSON object expected"
+                        continue
+                    row = {}
+                    for key, val in record.items():
+                        if key not in mapping:
+                            mapping[key] = self.__map_header(key, columns)
+                        if mapping[key]:
+                            row[mapping[key]] = val
+                    yield line, record, row
+
+        return self.__import(records(), rejects, chunkSize, auth, commit)
+
+    def __map_header(self, key, columns):
+        """
+        Implicit function to map a header (CSV) or a key (JSONL) to a parameter of the table
 
-            self.db.cursor.execute("INSERT INTO " + self.tableName + '(' + ",".join(kwargs.keys()) + ") " +
-                                   "VALUES(" + ','.join(["?"] * table_len_final) + ")", tuple(kwargs.values()))
+        :return: parameter name, None if unknown (ignored)
+        """
+        if columns and key in columns:
+            key = columns[key]
+        if key in self.tableVar:
+            return key
+        for param in self.tableVar:
+            if param.lower() == str(key).strip().lower():
+                return param
+        self.SQLtablelog.warning(functionName="import", message="'%s' is not a parameter of table '%s': ignored",
+                                 args=(key, self.tableName))
+        return None
+
+    def __import(self, records, rejects, chunkSize, auth, commit):
+        """
+        Implicit function writing the records of a file chunk by chunk => called in import_csv / import_jsonl
 
-        except (SqlFilterKeyEmptyError, SqlLengthParameterError, SqlNameParameterError, SqlTypeParameterError, SqlDoubleItemsOccurs) as e:
-            self.SQLtablelog.error(functionName="insert", message=e.args[0])
-            raise
+        :param records: generator of (line number, original record, dict row or error message)
+        :param rejects: RejectFile
+        :return: (number of rows inserted, number of rows rejected)
+        """
+        inserted = 0
+        try:
+            chunk = list(islice(records, chunkSize))
+            while chunk:
+                rows = []
+                errors = []
+                for line, record, row in chunk:
+                    if isinstance(row, dict):
+                        rows.append((line, record, row))
+                    else:
+                        errors.append((line, record, row))
+
+                count, rejected = self.insert_many([row for line, record, row in rows], auth=auth,
+                                                   chunkSize=min(chunkSize, 500))
+                inserted += count
+                errors += [(rows[idx][0], rows[idx][1], reason) for idx, reason in rejected]
+                for line, record, reason in sorted(errors, key=lambda error: error[0]):
+                    rejects.write(line, record, reason)
+                if commit and not self.db.transactionDepth:
+                    self.db.commit()
+
+                chunk = list(islice(records, chunkSize))
+        finally:
+            rejects.close()
 
-        except sqlite3.OperationalError:
-            self.SQLtablelog.error(functionName="insert", message="Please, check the definition of the table you try to access, " +
-                                                                  "parameter definition does not reach expectations")
+        self.SQLtablelog.info(functionName="import", message="IMPORT in %s: %d rows inserted | %d rows rejected",
+                              args=(self.tableName, inserted, rejects.count))
+        return inserted, rejects.count
 
+    @instrumented
     def modify(self, **kwargs):
         """
         Parameter already exists in table but you want to modify it anyway
@@ -234,128 +1579,721 @@ class SQLTable(object):
         :param kwargs: Primary key is mandatory to modify the table
         :return: None
         """
+        with self.db.writer():
+            #####################################################################################################
+            # Check & Compare the characteristics of the parameters
+            ''''# -> Table parameters (type, ...) have already been defined during table creation
+                #    This function checks that SQLTable.insert 'kwargs param' are inline with the table param
+                #       - ref_param = parameters @ creation of the table
+                #       - test_param = parameters @ call of insert function
+            '''
+            try:
+                check_param_char(ref_param=self.tableVar, test_param=kwargs, test='011')
+
+                # Extract Primary Key from Table info
+                search_param = next(iter(self.tablePrimVar.keys()))  # Primary parameter to search in the table
+
+                #####################################################################################################
+                # Check if Primary Parameter has been defined in entry.
+                if search_param in kwargs.keys():
+                    search_var = {k: v for k, v in kwargs.items()
+                                  if search_param.lower() == k.lower()}  # Variable to search for primary key
+                    kwargs.__delitem__(search_param)  # Delete primary key from parameters
+                    columns = tuple(kwargs.keys())
+                    tuple_param = tuple([kwargs[key] for key in kwargs]) + tuple([search_var[search_param]])
+
+                    #################################################################################################
+                    # Check first if it already exist in the table and if there are no double.
+                    presence = self.select_one(matchMode='exact' if search_param in self.normalizedKey else 'contains',
+                                               **search_var)
+                    presence_name = ", ".join([presence[i][0] for i in range(len(presence))])
+                    if (len(presence) == 1) or (search_var[search_param] in [presence[i][0] for i in range(len(presence))]):
+                        query = self.statementCache.get(('modify', columns, search_param),
+                                                        lambda: "UPDATE " + str(self.tableName) +
+                                                                " SET " + ','.join([key + "=?" for key in columns]) +
+                                                                " WHERE " + search_param + "=?")
+                        try:
+                            self.db.cursor.execute(query, tuple_param)
+                        except sqlite3.IntegrityError:
+                            if not self.uniqueFilter:
+                                raise
+                            raise SqlDoubleItemsOccurs("Item already exist in the database")
+                        self.db.written(self.tableName, self.db.cursor.rowcount)
+                        self.SQLtablelog.info(functionName="modify", message="Modify '%s' item from table '%s' with %s",
+                                              args=(search_var[search_param], self.tableName, kwargs))
+
+                    #################################################################################################
+                    # Double has been detected during modify process
+                    elif len(presence) > 1:
+                        raise SqlSeveralElementItemsSelected("Several elements contains the same name: [" +
+                                                                str(presence_name) + "] Choose the right one")
+
+                    #################################################################################################
+                    # No element detected with this name => use insert function instead
+                    else:
+                        raise SqlNoElementFound("No element found in that table => Use SQLTable.insert function instead")
+
+                #####################################################################################################
+                # Primary key is missing @ call
+                else:
+                    raise SqlMissingPrimaryKey("Missing primary key : " + str(search_param))
 
-        #####################################################################################################
-        # Check & Compare the characteristics of the parameters
-        ''''# -> Table parameters (type, ...) have already been defined during table creation
-            #    This function checks that SQLTable.insert 'kwargs param' are inline with the table param
-            #       - ref_param = parameters @ creation of the table
-            #       - test_param = parameters @ call of insert function
-        '''
-        try:
-            check_param_char(ref_param=self.tableVar, test_param=kwargs, test='011')
+            except (SqlLengthParameterError, SqlNameParameterError, SqlTypeParameterError, SqlDoubleItemsOccurs,
+                    SqlMissingPrimaryKey, SqlNoElementFound, SqlSeveralElementItemsSelected) as e:
+                self.SQLtablelog.error(functionName="modify", message=e.args[0])
+                raise
 
-            # Extract Primary Key from Table info
-            search_param = next(iter(self.tablePrimVar.keys()))  # Primary parameter to search in the table
+    @instrumented
+    def upsert(self, **kwargs):
+        """
+        Insert element into the associated table, or update it if its primary key already exists:
+        ONE statement INSERT ... ON CONFLICT(<primary key>) DO UPDATE, no research in the table.
 
-            #####################################################################################################
-            # Check if Primary Parameter has been defined in entry.
-            if search_param in kwargs.keys():
-                search_var = {k: v for k, v in kwargs.items()
-                              if search_param.lower() == k.lower()}  # Variable to search for primary key
-                kwargs.__delitem__(search_param)  # Delete primary key from parameters
-                list_other_param = [key + "=?" for key in kwargs]
-                list_search_param = search_param + "=?"
-                tuple_param = tuple([kwargs[key] for key in kwargs]) + tuple([search_var[search_param]])
+        :param kwargs: Primary key is mandatory, other parameters are optional
+        :return: number of affected rows
+        """
+        with self.db.writer():
+            try:
+                check_param_char(ref_param=self.tableVar, test_param=kwargs, test='011', converters=self.converters)
+
+                # Extract Primary Key from Table info
+                search_param = next(iter(self.tablePrimVar.keys()), None)
+                if search_param not in kwargs.keys():
+                    raise SqlMissingPrimaryKey("Missing primary key : " + str(search_param))
+
+                columns = tuple(kwargs.keys())
+                query = self.statementCache.get(('upsert', columns, search_param),
+                                                lambda: self.__upsert_query(columns, search_param))
+                try:
+                    self.db.cursor.execute(query, tuple(kwargs.values()))
+                except sqlite3.IntegrityError:
+                    if not self.uniqueFilter:
+                        raise
+                    raise SqlDoubleItemsOccurs("Item already exist in the database")
+                self.db.written(self.tableName, self.db.cursor.rowcount)
+
+                if self.SQLtablelog.isEnabledFor(logging.INFO):
+                    self.SQLtablelog.info(functionName="upsert", message="UPSERT in %s: %s",
+                                          args=(self.tableName, " | ".join([str(k) + "=" + str(v) for k, v in kwargs.items()])))
+                return self.db.cursor.rowcount
+
+            except (SqlNameParameterError, SqlTypeParameterError, SqlMissingPrimaryKey, SqlDoubleItemsOccurs) as e:
+                self.SQLtablelog.error(functionName="upsert", message=e.args[0])
+                raise
+
+    def __upsert_query(self, columns, search_param):
+        """
+        Implicit function to build the query of upsert => only called on statement cache miss
 
-                #################################################################################################
-                # Check first if it already exist in the table and if there are no double.
-                presence = self.select_one(**search_var)
-                presence_name = ", ".join([presence[i][0] for i in range(len(presence))])
-                if (len(presence) == 1) or (search_var[search_param] in [presence[i][0] for i in range(len(presence))]):
-                    self.db.cursor.execute("UPDATE " + str(self.tableName) +
-                                           " SET " + ','.join(list_other_param) +
-                                           " WHERE " + list_search_param, tuple_param)
-                    self.SQLtablelog.info(functionName="modify",
-                                          message="Modify '" + str(search_var[search_param]) +
-                                                  "' item from table '" + str(self.tableName) +
-                                                  "' with " + str(kwargs))
+        :param columns: parameters to insert/update
+        :param search_param: primary key
+        :return: SQL statement
+        """
+        others = [key for key in columns if key != search_param]
+        query = ("INSERT INTO " + self.tableName + '(' + ",".join(columns) + ") " +
+                 "VALUES(" + ','.join(["?"] * len(columns)) + ") ON CONFLICT(" + search_param + ") ")
+        if not others:
+            return query + "DO NOTHING"
+        return query + "DO UPDATE SET " + ','.join([key + "=excluded." + key for key in others])
+
+    @instrumented
+    def modify_many(self, rows):
+        """
+        Modify several elements identified by their exact primary key:
+        UPDATE ... WHERE <primary key>=? with executemany (one statement per set of parameters), in one savepoint.
+        Unlike SQLTable.modify, the primary key is NOT researched as a pattern.
 
-                #################################################################################################
-                # Double has been detected during modify process
-                elif len(presence) > 1:
-                    raise SqlSeveralElementItemsSelected("Several elements contains the same name: [" +
-                                                            str(presence_name) + "] Choose the right one")
+        :param rows: iterable of dict {param_name: value}, primary key is mandatory in each of them
+        :return: number of affected rows (elements not found are not counted)
+        """
+        with self.db.writer():
+            try:
+                search_param = next(iter(self.tablePrimVar.keys()), None)
 
                 #################################################################################################
-                # No element detected with this name => use insert function instead
-                else:
-                    raise SqlNoElementFound("No element found in that table => Use SQLTable.insert function instead")
-
-            #####################################################################################################
-            # Primary key is missing @ call
-            else:
-                raise SqlMissingPrimaryKey("Missing primary key : " + str(search_param))
-
-        except (SqlLengthParameterError, SqlNameParameterError, SqlTypeParameterError, SqlDoubleItemsOccurs,
-                SqlMissingPrimaryKey, SqlNoElementFound, SqlSeveralElementItemsSelected) as e:
-            self.SQLtablelog.error(functionName="modify", message=e.args[0])
-            raise
+                # Check every row & group them by set of parameters
+                groups = {}
+                for row in rows:
+                    row = dict(row)
+                    check_param_char(ref_param=self.tableVar, test_param=row, test='011', converters=self.converters)
+                    if search_param not in row.keys():
+                        raise SqlMissingPrimaryKey("Missing primary key : " + str(search_param))
+                    key = row.pop(search_param)
+                    if row:
+                        groups.setdefault(tuple(row.keys()), []).append(tuple(row.values()) + (key,))
 
-    def delete(self, inclusion=" AND ", **kwargs):
+                #################################################################################################
+                # One executemany per set of parameters
+                affected = 0
+                with self.db.savepoint("modify_many"):
+                    for columns, values in groups.items():
+                        query = self.statementCache.get(('modify', columns, search_param),
+                                                        lambda: "UPDATE " + str(self.tableName) +
+                                                                " SET " + ','.join([key + "=?" for key in columns]) +
+                                                                " WHERE " + search_param + "=?")
+                        try:
+                            self.db.cursor.executemany(query, values)
+                        except sqlite3.IntegrityError:
+                            if not self.uniqueFilter:
+                                raise
+                            raise SqlDoubleItemsOccurs("Item already exist in the database")
+                        affected += self.db.cursor.rowcount
+                self.db.written(self.tableName, affected)
+
+                self.SQLtablelog.info(functionName="modify_many", message="Modify %d items from table '%s'",
+                                      args=(affected, self.tableName))
+                return affected
+
+            except (SqlNameParameterError, SqlTypeParameterError, SqlMissingPrimaryKey, SqlDoubleItemsOccurs) as e:
+                self.SQLtablelog.error(functionName="modify_many", message=e.args[0])
+                raise
+
+    @instrumented
+    def delete(self, inclusion=" AND ", matchMode='contains', **kwargs):
         """
         Delete a data from table
 
         :param inclusion: define combinational logic between filter
+        :param matchMode: 'contains' (substring of every word), 'exact', 'prefix' => see SQLTable.define_normalized_keys,
+                          'equal' (strict equality, no normalization) or 'words' => see SQLTable.define_fulltext_keys
         :param kwargs: pattern research
-        :return: None
+        :return: number of rows deleted
+        """
+        with self.db.writer():
+            shape, filterval = self.__build_filter(inclusion, matchMode, kwargs)
+            query = self.statementCache.get(('delete', shape),
+                                            lambda: "DELETE FROM " + str(self.tableName) +
+                                                    " WHERE " + self.__filter_clause(shape))
+
+            try:
+                self.db.cursor.execute(query, filterval)
+                self.db.written(self.tableName, self.db.cursor.rowcount)
+                self.SQLtablelog.info(functionName="delete",
+                                      message="All data filtered with%s have been deleted from table '%s'",
+                                      args=(filterval, self.tableName))
+                return self.db.cursor.rowcount
+            except sqlite3.OperationalError:
+                self.SQLtablelog.error(functionName="delete",
+                                       message="Are you sure your parameter are correct")
+                return 0
+
+    @instrumented
+    def delete_many(self, keys, key=None, chunkSize=500):
         """
+        Delete the rows of a list of keys through the index of the key (primary key by default)
 
-        filterkey = []
-        filterval = []
-        for key, value in kwargs.items():
-            for i in str(value).split(' '):
-                filterkey.append("instr(noaccent(" + key + "), ?)>0")
-                filterval.append(translate_no_accent_nocase_sensitive(i))
-        filtertotal = inclusion.join(filterkey)
+            - up to 'chunkSize' keys: ONE statement binding the keys in an IN (...) list
+            - more keys: keys are streamed into a temporary table, then ONE 'DELETE ... IN (SELECT ...)'
 
-        try:
-            self.db.cursor.execute("DELETE FROM " + str(self.tableName) +
-                                   " WHERE " + filtertotal,
-                                   tuple(filterval))
-            self.SQLtablelog.info(functionName="delete",
-                                  message="All data filtered with" + str(filterval) +
-                                          " have been deleted from table '" + str(self.tableName) + "'")
-        except sqlite3.OperationalError:
-            self.SQLtablelog.error(functionName="delete",
-                                   message="Are you sure your parameter are correct")
+        :param keys: iterable of values (one key parameter) or of tuple (several key parameters), strict equality
+        :param key: key parameter or list of key parameters, primary key (or rowid) if None
+        :param chunkSize: number of keys bound per statement
+        :return: number of rows deleted
+        """
+        if key is None:
+            key = list(self.tablePrimVar) or ['rowid']
+        key = [key] if isinstance(key, str) else list(key)
+        self.__check_columns(key, "delete_many", rowid=True)
+        columns = key[0] if len(key) == 1 else "(" + ", ".join(key) + ")"
+        placeholder = "?" if len(key) == 1 else "(" + ", ".join(["?"] * len(key)) + ")"
+
+        def values(chunk):
+            if len(key) == 1:
+                return [val[0] if isinstance(val, (tuple, list)) else val for val in chunk]
+            return [val for row in chunk for val in row]
+
+        keys = iter(keys)
+        chunk = list(islice(keys, chunkSize))
+        deleted = 0
+        with self.db.writer() as cursor:
+            with self.db.savepoint("delete_many"):
+                following = list(islice(keys, chunkSize))
+                if not following:
+                    if chunk:
+                        cursor.execute("DELETE FROM " + self.tableName + " WHERE " + columns + " IN (" +
+                                       ("VALUES " if len(key) > 1 else "") + ", ".join([placeholder] * len(chunk)) +
+                                       ")", values(chunk))
+                        deleted = cursor.rowcount
+                else:
+                    # Many keys => temporary table (no limit of bound parameters, one statement for the delete)
+                    temporary = "temp.delete_many_keys"
+                    cursor.execute("DROP TABLE IF EXISTS " + temporary)
+                    cursor.execute("CREATE TABLE " + temporary + "(" + ", ".join(key) + ")")
+                    insert = "INSERT INTO " + temporary + " VALUES(" + ", ".join(["?"] * len(key)) + ")"
+                    while chunk:
+                        cursor.executemany(insert, [tuple(row) if isinstance(row, (tuple, list)) else (row,)
+                                                    for row in chunk])
+                        chunk, following = following, list(islice(keys, chunkSize))
+                    cursor.execute("DELETE FROM " + self.tableName + " WHERE " + columns + " IN (SELECT " +
+                                   ", ".join(key) + " FROM " + temporary + ")")
+                    deleted = cursor.rowcount
+                    cursor.execute("DROP TABLE " + temporary)
+            self.db.written(self.tableName, deleted)
+
+        self.SQLtablelog.info(functionName="delete_many", message="%d rows deleted from table '%s'",
+                              args=(deleted, self.tableName))
+        return deleted
+
+    @instrumented
+    def copy_to(self, dest, inclusion=" AND ", matchMode='contains', create=False, auth=False, **kwargs):
+        """
+        Copy the rows found as SQLTable.select_one (every row if no filter) into another table
+        with ONE 'INSERT INTO ... SELECT' statement, in the same database or in another file (ATTACH).
+        Changes are not committed (SQLDatabase.commit of the source database).
 
+        :param dest: SQLTable (same or other database) or name of a table of the same database
+        :param inclusion: Choose the logic for filtering between multiple parameters
+        :param matchMode: 'contains', 'exact', 'prefix' or 'words' => see SQLTable.select_one
+        :param create: True => 'dest' is the name of a new table created with the parameters & filter of this table
+        :param auth: same meaning as SQLTable.insert => True: ALL filter keys must match to detect an existing item
+        :param kwargs: Parameter to look for
+        :return: number of rows copied
+        """
+        return self.__transfer(dest, inclusion, matchMode, create, auth, kwargs, move=False)
+
+    @instrumented
+    def move_to(self, dest, inclusion=" AND ", matchMode='contains', create=False, auth=False, **kwargs):
+        """
+        Move the rows found as SQLTable.select_one (every row if no filter) into another table:
+        'INSERT INTO ... SELECT' then 'DELETE' in the same transaction => see SQLTable.copy_to
+
+        :return: number of rows moved
+        """
+        return self.__transfer(dest, inclusion, matchMode, create, auth, kwargs, move=True)
+
+    def __transfer(self, dest, inclusion, matchMode, create, auth, kwargs, move):
+        """
+        Implicit function to copy / move rows => called in copy_to / move_to
+
+            - SqlTableAlreadyExistError: 'create' and the table already exists
+            - SqlTablesAreDifferentsError: parameters (name & type) of both tables are not the same
+            - SqlNoItemToMoveError: no row found
+            - SqlExistOnDestinationTableError: a row found already exists in the destination (filter keys of the
+              destination, or its primary key) => nothing is written
+            - SqlAttachError: the destination is another ':memory:' database
+        """
+        functionName = "move_to" if move else "copy_to"
+        if isinstance(dest, str):
+            if create:
+                if dest in self.db.list_table():
+                    self.SQLtablelog.error(functionName=functionName, message="Table '" + dest + "' already exists")
+                    raise SqlTableAlreadyExistError("Table '" + dest + "' already exists in the database")
+                dest = SQLTable(self.db, dest, **self.tableVar)
+                if self.filterKey:
+                    dest.define_filter_for_insertion(self.filterKey, unique=self.uniqueFilter, auth=auth)
+            else:
+                dest = SQLTable(self.db, dest)
+
+        # Compatibility from the cached metadata => no query
+        columns = [key for key in self.tableVar if key != 'id']
+        destColumns = [key for key in dest.tableVar if key != 'id']
+        if sorted(columns) != sorted(destColumns) or \
+                any(self.converters[key] is not dest.converters[key] for key in columns):
+            self.SQLtablelog.error(functionName=functionName,
+                                   message="Tables '%s' and '%s' have different parameters",
+                                   args=(self.tableName, dest.tableName))
+            raise SqlTablesAreDifferentsError("Parameters of '" + self.tableName + "' and '" + dest.tableName +
+                                              "' are different")
+
+        shape, filterval = self.__build_filter(inclusion, matchMode, kwargs)
+        where = self.__filter_clause(shape) or "1"
+
+        with self.db.writer() as cursor:
+            # Two ':memory:' databases are distinct even with the same name => only the same object is shared
+            if dest.db is self.db:
+                target = dest.tableName
+            else:
+                target = self.db.attach(dest.db.databaseName) + "." + dest.tableName
+
+            # Rows of the destination with the same filter keys (normalized) => index lookups in the staged values
+            # of the destination. UNIQUE filter & primary key are enforced by the INSERT itself (IntegrityError)
+            staged = None
+            if dest.filterKey and not dest.uniqueFilter:
+                staged = dest.__stage_normalized_keys(cursor, target, auth)
+                keys = ["d." + column + "=noaccent(s." + key + ")" for key, column in zip(dest.filterKey, staged[1])]
+                existing = "EXISTS (SELECT 1 FROM " + staged[0] + " AS d WHERE " + \
+                           (" AND " if auth else " OR ").join(keys) + ")"
+            else:
+                existing = "0"
+
+            cursor.execute("SELECT COUNT(*), COUNT(NULLIF(" + existing + ", 0)) FROM " + self.tableName +
+                           " AS s WHERE " + where, filterval)
+            found, duplicates = cursor.fetchone()
+            if staged is not None and staged[0] != target:
+                cursor.execute("DROP TABLE " + staged[0])
+            if not found:
+                self.SQLtablelog.error(functionName=functionName, message="No item found with %s", args=(filterval,))
+                raise SqlNoItemToMoveError("No item of '" + self.tableName + "' matches the filter")
+            if duplicates:
+                self.SQLtablelog.error(functionName=functionName,
+                                       message="%d items already exist in table '%s'", args=(duplicates, dest.tableName))
+                raise SqlExistOnDestinationTableError(str(duplicates) + " items already exist in the table '" +
+                                                      dest.tableName + "'")
+
+            with self.db.savepoint(functionName):
+                try:
+                    cursor.execute("INSERT INTO " + target + "(" + ", ".join(columns) + ") SELECT " +
+                                   ", ".join(columns) + " FROM " + self.tableName + " AS s WHERE " + where, filterval)
+                except sqlite3.IntegrityError as e:
+                    self.SQLtablelog.error(functionName=functionName, message=e.args[0])
+                    raise SqlExistOnDestinationTableError(e.args[0])
+                count = cursor.rowcount
+                if move:
+                    cursor.execute("DELETE FROM " + self.tableName + " WHERE " + where, filterval)
+            self.db.written(self.tableName, count if move else 0)
+            self.db.written(dest.tableName, count)
+            dest.db.invalidate(dest.tableName)
+
+        self.SQLtablelog.info(functionName=functionName, message="%d rows from '%s' to '%s'",
+                              args=(count, self.tableName, dest.tableName))
+        return count
+
+    @instrumented
     def select_all(self):
         """
         Query the database to extract all information from the selected table
 
         :return: Tuple of information
         """
-        self.db.cursor.execute("SELECT " + ", ".join(self.tableVar.keys()) +
-                               " FROM " + str(self.tableName))
-        return self.db.cursor.fetchall()
-
-    def select_one(self, inclusion=" AND ", **kwargs):
+        query = self.statementCache.get(('select_all',),
+                                        lambda: "SELECT " + ", ".join(self.tableVar.keys()) +
+                                                " FROM " + str(self.tableName))
+        with self.db.reader() as cursor:
+            version = None if self.resultCache is None else self.db.data_version(self.tableName)
+            if version is not None:
+                rows = self.resultCache.get(('select_all',), version)
+                if rows is not None:
+                    return rows
+
+            cursor.execute(query)
+            rows = cursor.fetchall()
+
+        if version is not None:
+            self.resultCache.put(('select_all',), version, rows)
+        return rows
+
+    @instrumented
+    def select_one(self, inclusion=" AND ", matchMode='contains', **kwargs):
         """
         Query the database to extract the information of a predefined name of the Table
 
         :param inclusion: Choose the logic for filtering between multiple parameters
+        :param matchMode: 'contains' (substring of every word), 'exact', 'prefix' => see SQLTable.define_normalized_keys,
+                          'equal' (strict equality, no normalization) or 'words' => see SQLTable.define_fulltext_keys
         :param kwargs: Parameter to look for
         :return: result of research
         """
-        filterkey = []
-        filterval = []
-        for key, value in kwargs.items():
-            for i in str(value).split(' '):
-                filterkey.append("instr(noaccent(" + key + "), ?)>0")
-                filterval.append(translate_no_accent_nocase_sensitive(i))
-        filtertotal = inclusion.join(filterkey)
+        shape, filterval = self.__build_filter(inclusion, matchMode, kwargs)
+        query = self.statementCache.get(('select_one', shape),
+                                        lambda: "SELECT " + ", ".join(self.tableVar.keys()) +
+                                                " FROM " + str(self.tableName) +
+                                                " WHERE " + self.__filter_clause(shape))
+
+        with self.db.reader() as cursor:
+            version = None if self.resultCache is None else self.db.data_version(self.tableName)
+            if version is not None:
+                rows = self.resultCache.get((shape, filterval), version)
+                if rows is not None:
+                    return rows
+
+            try:
+                cursor.execute(query, filterval)
+            except sqlite3.OperationalError:
+                self.SQLtablelog.error(functionName="select_one",
+                                       message="Did you define a filter before insertion?")
+                return cursor.fetchall()
+            rows = cursor.fetchall()
+
+        if version is not None:
+            self.resultCache.put((shape, filterval), version, rows)
+        return rows
+
+    def iter_all(self, columns=None, limit=None, batchSize=1000):
+        """
+        Stream all information from the selected table, on its own cursor (shared cursor is not clobbered)
 
-        try:
-            self.db.cursor.execute("SELECT " + ", ".join(self.tableVar.keys()) +
-                                   " FROM " + str(self.tableName)  +
-                                   " WHERE " + filtertotal,
-                                   tuple(filterval))
-        except sqlite3.OperationalError:
-            self.SQLtablelog.error(functionName="select_one",
-                                   message="Did you define a filter before insertion?")
+        :param columns: list of parameters to extract (projection), every parameter if None
+        :param limit: maximum number of rows, no limit if None
+        :param batchSize: number of rows fetched at once (fetchmany)
+        :return: generator of tuple
+        """
+        return self.__iter_query(('iter_all',), (), columns, limit, batchSize)
+
+    def iter_where(self, inclusion=" AND ", matchMode='contains', columns=None, limit=None, batchSize=1000, **kwargs):
+        """
+        Stream the information of a predefined name of the Table (same research as SQLTable.select_one),
+        on its own cursor (shared cursor is not clobbered)
+
+        :param inclusion: Choose the logic for filtering between multiple parameters
+        :param matchMode: 'contains', 'exact', 'prefix' or 'words' => see SQLTable.select_one
+        :param columns: list of parameters to extract (projection), every parameter if None
+        :param limit: maximum number of rows, no limit if None
+        :param batchSize: number of rows fetched at once (fetchmany)
+        :param kwargs: Parameter to look for
+        :return: generator of tuple
+        """
+        shape, filterval = self.__build_filter(inclusion, matchMode, kwargs)
+        return self.__iter_query(shape, filterval, columns, limit, batchSize)
+
+    def __iter_query(self, shape, filterval, columns, limit, batchSize):
+        """
+        Implicit function to stream a SELECT => called in iter_all / iter_where
+
+        :param shape: ('iter_all',) or shape of the WHERE clause => see __build_filter
+        :param filterval: values of the WHERE clause
+        :param columns: list of parameters to extract, every parameter if None
+        :param limit: maximum number of rows, no limit if None
+        :param batchSize: number of rows fetched at once
+        :return: generator of tuple
+        """
+        columns = tuple(self.tableVar.keys()) if columns is None else tuple(columns)
+        self.__check_columns(columns, "iter")
+
+        query = self.statementCache.get(('iter', shape, columns, limit is not None),
+                                        lambda: "SELECT " + ", ".join(columns) + " FROM " + str(self.tableName) +
+                                                ("" if shape == ('iter_all',) else " WHERE " + self.__filter_clause(shape)) +
+                                                ("" if limit is None else " LIMIT ?"))
+        if limit is not None:
+            filterval = tuple(filterval) + (limit,)
+
+        def generator():
+            # Own cursor on a reader connection (checked out until the end of the iteration)
+            with self.db.reader() as shared:
+                cursor = self.db.open_cursor(shared.connection)
+                try:
+                    cursor.execute(query, filterval)
+                    rows = cursor.fetchmany(batchSize)
+                    while rows:
+                        yield from rows
+                        rows = cursor.fetchmany(batchSize)
+                finally:
+                    cursor.close()
+
+        return generator()
+
+    @instrumented
+    def page(self, after=None, limit=100, order_by=None, where=None, descending=False, columns=None,
+             inclusion=" AND ", matchMode='contains'):
+        """
+        Keyset (seek) pagination: the next page starts right after the last row of the previous one
+        through the index of 'order_by' => the cost of a page does not depend on its depth (no OFFSET).
+
+            rows, token = table.page(limit=50)
+            while token:
+                rows, token = table.page(after=token, limit=50)
+
+        Ties of 'order_by' are broken by rowid, rows with a NULL 'order_by' are skipped.
+
+        :param after: token returned with the previous page, None for the first page
+        :param limit: maximum number of rows of the page (>= 1)
+        :param order_by: parameter to sort on (indexed parameter expected), primary key (or rowid) if None
+        :param where: dictionary of Parameters to look for => same research as SQLTable.select_one
+        :param descending: sort in descending order
+        :param columns: list of parameters to extract, every parameter if None
+        :param inclusion: Choose the logic for filtering between multiple parameters of 'where'
+        :param matchMode: 'contains', 'exact', 'prefix' or 'words' => see SQLTable.select_one
+        :return: (list of tuple, token of the next page or None if it is the last one)
+        """
+        if not isinstance(limit, int) or limit < 1:
+            self.SQLtablelog.error(functionName="page", message="Invalid limit: %r", args=(limit,))
+            raise ValueError("Page limit must be an integer >= 1, not " + repr(limit))
+        if order_by is None:
+            order_by = next(iter(self.tablePrimVar)) if len(self.tablePrimVar) == 1 else 'rowid'
+        columns = tuple(self.tableVar.keys()) if columns is None else tuple(columns)
+        self.__check_columns(columns, "page")
+        self.__check_columns((order_by,), "page", rowid=True)
+        if after is None and order_by != 'rowid' and order_by not in self.tablePrimVar and \
+                order_by not in self.__indexed_columns():
+            self.SQLtablelog.warning(functionName="page",
+                                     message="'%s' is not indexed: every page sorts the table '%s'",
+                                     args=(order_by, self.tableName))
+
+        shape, filterval = self.__build_filter(inclusion, matchMode, where or {})
+        if after is not None:
+            state = decode_page_token(after)
+            if len(state) != 4 or state[:2] != [order_by, bool(descending)]:
+                raise ValueError("Page token does not match order_by=" + str(order_by) +
+                                 ", descending=" + str(bool(descending)))
+            filterval = tuple(filterval) + tuple(state[2:])
+
+        keys = (order_by,) if order_by == 'rowid' else (order_by, 'rowid')
+        direction = " DESC" if descending else ""
+
+        def build():
+            clauses = [] if order_by == 'rowid' else [order_by + " IS NOT NULL"]
+            if len(shape) > 1:
+                clauses.append("(" + self.__filter_clause(shape) + ")")
+            if after is not None:
+                clauses.append("(" + ", ".join(keys) + ")" + (" < " if descending else " > ") +
+                               "(" + ", ".join(["?"] * len(keys)) + ")")
+            return "SELECT " + ", ".join(columns + keys) + " FROM " + str(self.tableName) + \
+                   (" WHERE " + " AND ".join(clauses) if clauses else "") + \
+                   " ORDER BY " + ", ".join(key + direction for key in keys) + " LIMIT ?"
+
+        query = self.statementCache.get(('page', shape, columns, order_by, bool(descending), after is not None), build)
+        if order_by == 'rowid' and after is not None:
+            filterval = filterval[:-1]                                   # Only rowid in the key
+
+        with self.db.reader() as cursor:
+            cursor.execute(query, tuple(filterval) + (limit + 1,))
+            rows = cursor.fetchall()
+
+        token = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1][len(columns):]
+            token = encode_page_token([order_by, bool(descending), last[0], last[-1]])
+        return [row[:len(columns)] for row in rows], token
+
+    def __indexed_columns(self):
+        """
+        Implicit function: first column of every index of the table, memoized until the schema changes
+
+        :return: set of parameter names
+        """
+        if self.indexedVersion != self.schemaVersion:
+            indexed = set()
+            with self.db.reader() as cursor:
+                cursor.execute("PRAGMA index_list(" + self.tableName + ")")
+                for index in cursor.fetchall():
+                    cursor.execute("PRAGMA index_info(" + index[1] + ")")
+                    first = cursor.fetchone()
+                    if first is not None and first[2] is not None:
+                        indexed.add(first[2])
+            self.indexedColumns, self.indexedVersion = indexed, self.schemaVersion
+        return self.indexedColumns
+
+    @instrumented
+    def select_columns(self, columns=None, inclusion=" AND ", matchMode='contains', limit=None, chunkSize=10000,
+                       **kwargs):
+        """
+        Extract parameters column by column (same research as SQLTable.select_one if kwargs are given).
+        Rows are streamed by chunk into preallocated NumPy arrays => peak memory close to the size of the arrays.
+
+        dtype of each parameter: INTEGER => int64, REAL/FLOAT => float64, otherwise object.
+        A NULL in a numeric parameter turns its array into float64 (NaN), another type into object.
 
-        return self.db.cursor.fetchall()
+        :param columns: list of parameters to extract, every parameter if None
+        :param inclusion: Choose the logic for filtering between multiple parameters
+        :param matchMode: 'contains', 'exact', 'prefix' or 'words' => see SQLTable.select_one
+        :param limit: maximum number of rows, no limit if None
+        :param chunkSize: number of rows fetched at once (fetchmany)
+        :param kwargs: Parameter to look for
+        :return: dictionary {<param_name>: NumPy array}, {<param_name>: list} if NumPy is not installed
+        """
+        columns, arrays = self.__fetch_columns(columns, inclusion, matchMode, limit, chunkSize, kwargs,
+                                               structured=False)
+        return dict(zip(columns, arrays))
+
+    @instrumented
+    def to_numpy(self, columns=None, inclusion=" AND ", matchMode='contains', limit=None, chunkSize=10000, **kwargs):
+        """
+        Extract the table (or the rows found as SQLTable.select_one) in a NumPy structured array,
+        one field per parameter => see SQLTable.select_columns for the dtypes
+
+        :param columns: list of parameters to extract, every parameter if None
+        :param inclusion: Choose the logic for filtering between multiple parameters
+        :param matchMode: 'contains', 'exact', 'prefix' or 'words' => see SQLTable.select_one
+        :param limit: maximum number of rows, no limit if None
+        :param chunkSize: number of rows fetched at once (fetchmany)
+        :param kwargs: Parameter to look for
+        :return: NumPy structured array, {<param_name>: list} if NumPy is not installed
+        """
+        columns, arrays = self.__fetch_columns(columns, inclusion, matchMode, limit, chunkSize, kwargs,
+                                               structured=True)
+        if numpy is None:
+            self.SQLtablelog.warning(functionName="to_numpy",
+                                     message="NumPy is not installed: dictionary of lists returned")
+            return dict(zip(columns, arrays))
+        return arrays
+
+    def __fetch_columns(self, columns, inclusion, matchMode, limit, chunkSize, kwargs, structured):
+        """
+        Implicit function to stream a SELECT into columns => called in select_columns / to_numpy
+
+        :return: (tuple of parameters, list of arrays (or lists) | structured array)
+        """
+        columns = tuple(self.tableVar.keys()) if columns is None else tuple(columns)
+        self.__check_columns(columns, "select_columns")
+
+        shape, filterval = self.__build_filter(inclusion, matchMode, kwargs) if kwargs else (('iter_all',), ())
+        where = "" if shape == ('iter_all',) else " WHERE " + self.__filter_clause(shape)
+        countQuery = self.statementCache.get(('count', shape),
+                                             lambda: "SELECT COUNT(*) FROM " + str(self.tableName) + where)
+        query = self.statementCache.get(('iter', shape, columns, limit is not None),
+                                        lambda: "SELECT " + ", ".join(columns) + " FROM " + str(self.tableName) +
+                                                where + ("" if limit is None else " LIMIT ?"))
+
+        with self.db.reader() as shared:
+            cursor = self.db.open_cursor(shared.connection)
+            try:
+                if numpy is None:
+                    arrays = [[] for key in columns]
+                    cursor.execute(query, filterval if limit is None else tuple(filterval) + (limit,))
+                    rows = cursor.fetchmany(chunkSize)
+                    while rows:
+                        for array, values in zip(arrays, zip(*rows)):
+                            array.extend(values)
+                        rows = cursor.fetchmany(chunkSize)
+                    return columns, arrays
+
+                cursor.execute(countQuery, filterval)
+                size = cursor.fetchone()[0]
+                if limit is not None:
+                    size = min(size, limit)
+                dtypes = [column_dtype(self.converters[key]) for key in columns]
+                if structured:
+                    arrays = numpy.empty(size, dtype=list(zip(columns, dtypes)))
+                else:
+                    arrays = [numpy.empty(size, dtype=dtype) for dtype in dtypes]
+
+                cursor.execute(query, filterval if limit is None else tuple(filterval) + (limit,))
+                position = 0
+                rows = cursor.fetchmany(chunkSize)
+                while rows:
+                    if position + len(rows) > size:
+                        # Rows committed by another connection since the count
+                        size = max(2 * size, position + len(rows))
+                        arrays = self.__resize_columns(arrays, size, structured)
+                    for i, values in enumerate(zip(*rows)):
+                        if structured:
+                            field = arrays[columns[i]]
+                            filled = fill_column(field, position, values)
+                            if filled is not field:
+                                arrays = self.__upgrade_field(arrays, columns[i], filled)
+                        else:
+                            arrays[i] = fill_column(arrays[i], position, values)
+                    position += len(rows)
+                    rows = cursor.fetchmany(chunkSize)
+            finally:
+                cursor.close()
+
+        if position < size:
+            arrays = arrays[:position] if structured else [array[:position] for array in arrays]
+        return columns, arrays
+
+    @staticmethod
+    def __resize_columns(arrays, size, structured):
+        if structured:
+            resized = numpy.empty(size, dtype=arrays.dtype)
+            resized[:len(arrays)] = arrays
+            return resized
+        resized = []
+        for array in arrays:
+            resized.append(numpy.empty(size, dtype=array.dtype))
+            resized[-1][:len(array)] = array
+        return resized
+
+    @staticmethod
+    def __upgrade_field(array, name, column):
+        """
+        Implicit function to rebuild a structured array with a field of another dtype => see fill_column
+        """
+        dtype = [(field, column.dtype if field == name else array.dtype[field]) for field in array.dtype.names]
+        upgraded = numpy.empty(len(array), dtype=dtype)
+        for field in array.dtype.names:
+            upgraded[field] = column if field == name else array[field]
+        return upgraded
 
 if __name__ == "__main__":
     # define SQL Database
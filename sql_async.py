@@ -0,0 +1,332 @@
+##############################################################################################
+# Project     : sqlite3 wrapper
+# File        : sql_async.py
+# Author      : Remi Malaquin
+# Date        : 01/17/2018
+# Description : asyncio facade of SQLDatabase & SQLTable.
+##############################################################################################
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from sql_access import *
+
+
+class AsyncSQLDatabase:
+    """
+    Manage Database from asyncio code.
+
+       - Every access runs on ONE dedicated thread owning the connection => the event loop is never blocked
+       - Pending operations wait in a bounded queue => producers are suspended when it is full (backpressure)
+       - Writes waiting together in the queue are coalesced in ONE transaction, committed once (autoCommit)
+    """
+
+    def __init__(self, databaseName="/default/directory/DBName", maxPending=1000, maxBatch=500, autoCommit=True,
+                 **kwargs):
+        """
+        Define the database, the connection is opened by the dedicated thread on first access.
+
+        :param databaseName: DB file to create/read
+        :param maxPending: maximum number of operations waiting in the queue
+        :param maxBatch: maximum number of operations run (and writes coalesced) in a row
+        :param autoCommit: commit once after each batch of writes, otherwise call AsyncSQLDatabase.commit
+        :param kwargs: other parameters of SQLDatabase (statementCacheSize, ...)
+        """
+        self.databaseName = databaseName
+        self.databaseArgs = kwargs
+        self.maxPending   = maxPending
+        self.maxBatch     = maxBatch
+        self.autoCommit   = autoCommit
+        self.base         = None                                         # SQLDatabase owned by the dedicated thread
+        self.executor     = ThreadPoolExecutor(max_workers=1, thread_name_prefix="AsyncSQLDatabase")
+        self.queue        = None
+        self.dispatcher   = None
+
+        self.SQLdblog = Logger(name='AsyncSQLDatabase', severity=logging.INFO)
+
+    async def run(self, function, write=False):
+        """
+        Queue a function to run on the dedicated thread and wait for its result
+
+        :param function: function called without parameter, can use AsyncSQLDatabase.base
+        :param write: True if the function modifies the database (coalesced in a shared transaction)
+        :return: result of the function (its exception is raised)
+        """
+        loop = asyncio.get_running_loop()
+        if self.dispatcher is None:
+            self.queue = asyncio.Queue(maxsize=self.maxPending)
+            self.dispatcher = loop.create_task(self.__dispatch())
+
+        future = loop.create_future()
+        await self.queue.put((function, write, future))
+        return await future
+
+    async def __dispatch(self):
+        """
+        Implicit task consuming the queue: operations available at once are run in a row on the dedicated thread
+
+        :return: None
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            while len(batch) < self.maxBatch and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+
+            try:
+                results = await loop.run_in_executor(self.executor, self.__run_batch,
+                                                     [(function, write) for function, write, future in batch])
+            except Exception as e:
+                results = [(False, e)] * len(batch)
+
+            for (function, write, future), (success, value) in zip(batch, results):
+                if future.cancelled():
+                    continue
+                if success:
+                    future.set_result(value)
+                else:
+                    future.set_exception(value)
+
+    def __run_batch(self, batch):
+        """
+        Implicit function run on the dedicated thread: every write is isolated in a savepoint
+        of the shared transaction, so one failing write does not roll back the others.
+
+        :param batch: list of (function, write)
+        :return: list of (success, result or exception)
+        """
+        if self.base is None:
+            self.base = SQLDatabase(self.databaseName, **self.databaseArgs)
+
+        results = []
+        writes = any(write for function, write in batch)
+        with self.base.writer() as cursor:
+            if writes and not self.base.base.in_transaction:
+                cursor.execute("BEGIN")
+
+            for function, write in batch:
+                try:
+                    if write:
+                        cursor.execute("SAVEPOINT async_write")
+                    results.append((True, function()))
+                    if write:
+                        cursor.execute("RELEASE async_write")
+                except Exception as e:
+                    if write:
+                        self.base.invalidate()
+                        cursor.execute("ROLLBACK TO async_write")
+                        cursor.execute("RELEASE async_write")
+                    results.append((False, e))
+
+            if writes and self.autoCommit:
+                self.base.commit()
+        return results
+
+    async def commit(self):
+        """
+        Commit changes into the database
+
+        :return: None
+        """
+        return await self.run(lambda: self.base.commit())
+
+    async def backup(self, dest, pages_per_step=BACKUP_PAGES_PER_STEP, sleep=0.005, progress=None, vacuum=False):
+        return await self.run(lambda: self.base.backup(dest, pages_per_step, sleep, progress, vacuum))
+
+    async def settings(self):
+        return await self.run(lambda: self.base.settings())
+
+    async def enable_metrics(self, slowQuery=None, progressSteps=PROGRESS_STEPS):
+        return await self.run(lambda: self.base.enable_metrics(slowQuery, progressSteps))
+
+    async def disable_metrics(self):
+        return await self.run(lambda: self.base.disable_metrics())
+
+    async def stats(self):
+        return await self.run(lambda: self.base.stats())
+
+    async def list_table(self):
+        """
+        List all the table inside the database
+
+        :return: list of table name
+        """
+        return await self.run(lambda: self.base.list_table())
+
+    async def tables(self):
+        return await self.run(lambda: self.base.tables())
+
+    async def drop(self, table: str):
+        return await self.run(lambda: self.base.drop(table), write=True)
+
+    async def close(self):
+        """
+        Close Database once every queued operation is done & stop the dedicated thread
+
+        :return: None
+        """
+        if self.dispatcher is not None:
+            await self.run(lambda: self.base.close())
+            self.dispatcher.cancel()
+            self.dispatcher = None
+        self.executor.shutdown(wait=True)
+        self.SQLdblog.debug(functionName="close",
+                            message="Close Database")
+
+
+class AsyncSQLTable(object):
+    """
+    Manage Table in a database from asyncio code => same API as SQLTable, every method must be awaited.
+    """
+
+    def __init__(self, asyncDbObj, tableName, **kwargs):
+        """
+        Define table related to a database, with its name and its parameters.
+        The table is created (or its info extracted) on first access => see SQLTable.__init__
+
+        :param asyncDbObj: AsyncSQLDatabase object
+        :param tableName: table name
+        :param kwargs: <param_name1>='<param_type1>', <param_name2>='<param_type2>', ...
+        """
+        self.db        = asyncDbObj                                      # related database object
+        self.tableName = tableName                                       # Name of the table
+        self.tableArgs = kwargs                                          # Parameters of the table
+        self.table     = None                                            # SQLTable, created by the dedicated thread
+
+    def __table(self):
+        """
+        Implicit function run on the dedicated thread to get the SQLTable object
+
+        :return: SQLTable
+        """
+        if self.table is None:
+            if self.tableArgs:
+                self.table = SQLTable(self.db.base, self.tableName, **self.tableArgs)
+            else:
+                self.table = self.db.base.open_table(self.tableName)    # Existing table => memoized metadata
+        return self.table
+
+    async def query_info(self):
+        return await self.db.run(lambda: self.__table().query_info())
+
+    async def schema(self):
+        return await self.db.run(lambda: self.__table().schema())
+
+    async def define_filter_for_insertion(self, filterKeys: list, unique=False, auth=False, normalized=True):
+        return await self.db.run(lambda: self.__table().define_filter_for_insertion(filterKeys, unique, auth, normalized),
+                                 write=True)
+
+    async def define_normalized_keys(self, normalizedKeys: list):
+        return await self.db.run(lambda: self.__table().define_normalized_keys(normalizedKeys), write=True)
+
+    async def define_fulltext_keys(self, fulltextKeys: list):
+        return await self.db.run(lambda: self.__table().define_fulltext_keys(fulltextKeys), write=True)
+
+    async def enable_result_cache(self, maxSize=256, ttl=None):
+        return await self.db.run(lambda: self.__table().enable_result_cache(maxSize, ttl))
+
+    async def result_stats(self):
+        return await self.db.run(lambda: self.__table().result_stats())
+
+    async def insert(self, auth=False, **kwargs):
+        return await self.db.run(lambda: self.__table().insert(auth=auth, **kwargs), write=True)
+
+    async def insert_many(self, rows, auth=False, chunkSize=500):
+        return await self.db.run(lambda: self.__table().insert_many(rows, auth=auth, chunkSize=chunkSize), write=True)
+
+    async def import_csv(self, path, columns=None, chunkSize=IMPORT_CHUNK_SIZE, auth=False, rejectPath=None,
+                         commit=True, encoding='utf-8', **csvArgs):
+        # Committed chunk by chunk => not coalesced in the shared transaction of the writes
+        return await self.db.run(lambda: self.__table().import_csv(path, columns, chunkSize, auth, rejectPath, commit,
+                                                                   encoding, **csvArgs), write=not commit)
+
+    async def import_jsonl(self, path, columns=None, chunkSize=IMPORT_CHUNK_SIZE, auth=False, rejectPath=None,
+                           commit=True, encoding='utf-8'):
+        return await self.db.run(lambda: self.__table().import_jsonl(path, columns, chunkSize, auth, rejectPath,
+                                                                     commit, encoding), write=not commit)
+
+    async def modify(self, **kwargs):
+        return await self.db.run(lambda: self.__table().modify(**kwargs), write=True)
+
+    async def upsert(self, **kwargs):
+        return await self.db.run(lambda: self.__table().upsert(**kwargs), write=True)
+
+    async def modify_many(self, rows):
+        return await self.db.run(lambda: self.__table().modify_many(rows), write=True)
+
+    async def delete(self, inclusion=" AND ", matchMode='contains', **kwargs):
+        return await self.db.run(lambda: self.__table().delete(inclusion, matchMode, **kwargs), write=True)
+
+    async def delete_many(self, keys, key=None, chunkSize=500):
+        return await self.db.run(lambda: self.__table().delete_many(keys, key, chunkSize), write=True)
+
+    async def copy_to(self, dest, inclusion=" AND ", matchMode='contains', create=False, auth=False, **kwargs):
+        return await self.db.run(lambda: self.__table().copy_to(self.__dest(dest), inclusion, matchMode, create, auth,
+                                                                **kwargs), write=True)
+
+    async def move_to(self, dest, inclusion=" AND ", matchMode='contains', create=False, auth=False, **kwargs):
+        return await self.db.run(lambda: self.__table().move_to(self.__dest(dest), inclusion, matchMode, create, auth,
+                                                                **kwargs), write=True)
+
+    @staticmethod
+    def __dest(dest):
+        # AsyncSQLTable of the same AsyncSQLDatabase => its SQLTable (run on the dedicated thread)
+        return dest.__table() if isinstance(dest, AsyncSQLTable) else dest
+
+    async def select_all(self):
+        return await self.db.run(lambda: self.__table().select_all())
+
+    async def select_one(self, inclusion=" AND ", matchMode='contains', **kwargs):
+        return await self.db.run(lambda: self.__table().select_one(inclusion, matchMode, **kwargs))
+
+    async def page(self, after=None, limit=100, order_by=None, where=None, descending=False, columns=None,
+                   inclusion=" AND ", matchMode='contains'):
+        return await self.db.run(lambda: self.__table().page(after, limit, order_by, where, descending, columns,
+                                                             inclusion, matchMode))
+
+    async def select_columns(self, columns=None, inclusion=" AND ", matchMode='contains', limit=None,
+                             chunkSize=10000, **kwargs):
+        return await self.db.run(lambda: self.__table().select_columns(columns, inclusion, matchMode, limit,
+                                                                       chunkSize, **kwargs))
+
+    async def to_numpy(self, columns=None, inclusion=" AND ", matchMode='contains', limit=None, chunkSize=10000,
+                       **kwargs):
+        return await self.db.run(lambda: self.__table().to_numpy(columns, inclusion, matchMode, limit, chunkSize,
+                                                                 **kwargs))
+
+    async def iter_all(self, columns=None, limit=None, batchSize=1000):
+        """
+        Stream all information from the selected table => async for row in table.iter_all(...)
+        Rows are fetched by batch of 'batchSize' on the dedicated thread.
+        """
+        rows = await self.db.run(lambda: self.__table().iter_all(columns, limit, batchSize))
+        async for row in self.__iter_rows(rows, batchSize):
+            yield row
+
+    async def iter_where(self, inclusion=" AND ", matchMode='contains', columns=None, limit=None, batchSize=1000,
+                         **kwargs):
+        """
+        Stream the information of a predefined name of the Table => async for row in table.iter_where(...)
+        Rows are fetched by batch of 'batchSize' on the dedicated thread.
+        """
+        rows = await self.db.run(lambda: self.__table().iter_where(inclusion, matchMode, columns, limit, batchSize,
+                                                                   **kwargs))
+        async for row in self.__iter_rows(rows, batchSize):
+            yield row
+
+    async def __iter_rows(self, rows, batchSize):
+        """
+        Implicit function to consume a SQLTable generator by batch on the dedicated thread
+
+        :param rows: generator returned by SQLTable.iter_all / SQLTable.iter_where
+        :param batchSize: number of rows per batch
+        :return: async generator of tuple
+        """
+        try:
+            chunk = await self.db.run(lambda: list(islice(rows, batchSize)))
+            while chunk:
+                for row in chunk:
+                    yield row
+                chunk = await self.db.run(lambda: list(islice(rows, batchSize)))
+        finally:
+            await self.db.run(rows.close)
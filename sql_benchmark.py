@@ -0,0 +1,260 @@
+##############################################################################################
+# Project     : sqlite3 wrapper
+# File        : sql_benchmark.py
+# Author      : Remi Malaquin
+# Date        : 01/17/2018
+# Description : Reproducible benchmark of SQLTable operations, JSON results & comparison.
+##############################################################################################
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+
+from sql_access import *
+
+
+# Synthetic schemas, same as the demo of sql_access.py
+SCHEMAS = {
+    'Cars': {'name': 'TEXT PRIMARY KEY', 'brand': 'TEXT', 'color': 'TEXT', 'price': 'FLOAT', 'horsepower': 'INTEGER'},
+    'Ingredient': {'name': 'TEXT PRIMARY KEY', 'calory': 'INTEGER', 'portion': 'FLOAT', 'unit': 'TEXT'},
+}
+BRANDS = ['BMW', 'Tesla', 'Renault', 'Peugeot', 'Citroën', 'Škoda', 'Audi', 'Fiat']
+COLORS = ['Blue', 'Red', 'Green', 'Black', 'White', 'Grey']
+UNITS = ['g', 'kg', 'ml', 'l', 'piece']
+
+DEFAULT_SIZES = [1000, 100000, 1000000]
+DEFAULT_STORAGES = ['file', 'memory']
+
+
+def make_row(schema, index, rand):
+    """
+    Build the synthetic row 'index' of a schema
+
+    :param schema: 'Cars' or 'Ingredient'
+    :param index: number of the row => unique name
+    :param rand: random.Random object
+    :return: dictionary {<param_name>: <value>}
+    """
+    if schema == 'Cars':
+        return {'name': "car%08d" % index, 'brand': rand.choice(BRANDS), 'color': rand.choice(COLORS),
+                'price': round(rand.uniform(5000, 200000), 2), 'horsepower': rand.randint(50, 800)}
+    return {'name': "ingredient%08d" % index, 'calory': rand.randint(0, 10000),
+            'portion': round(rand.uniform(0, 1000), 2), 'unit': rand.choice(UNITS)}
+
+
+def summarize(samples, elapsed):
+    """
+    Statistics of the latencies of one operation
+
+    :param samples: list of latencies in seconds
+    :param elapsed: total time in seconds
+    :return: dictionary {'count', 'seconds', 'opsPerSecond', 'mean', 'p50', 'p99', 'max'} (latencies in seconds)
+    """
+    ordered = sorted(samples)
+    count = len(ordered)
+
+    def percentile(p):
+        # Nearest-rank percentile
+        return ordered[max(0, min(count - 1, int(round(p / 100.0 * count + 0.5)) - 1))] if count else None
+
+    return {'count': count, 'seconds': elapsed, 'opsPerSecond': count / elapsed if elapsed else None,
+            'mean': sum(ordered) / count if count else None, 'p50': percentile(50), 'p99': percentile(99),
+            'max': ordered[-1] if count else None}
+
+
+def measure(function, arguments, budget):
+    """
+    Time 'function' called once per item of 'arguments', stop when the time budget is exceeded
+
+    :param function: function called with one argument
+    :param arguments: list of arguments
+    :param budget: maximum time in seconds (at least one call is done)
+    :return: statistics => see summarize
+    """
+    samples = []
+    clock = time.perf_counter
+    start = clock()
+    for argument in arguments:
+        begin = clock()
+        function(argument)
+        samples.append(clock() - begin)
+        if begin - start > budget:
+            break
+    return summarize(samples, clock() - start)
+
+
+def bench_case(schema, size, storage, samples=200, budget=10.0, seed=0, directory=None, profile=None):
+    """
+    Run every operation on a table of 'size' synthetic rows
+
+    :param schema: 'Cars' or 'Ingredient'
+    :param size: number of rows loaded before the measures
+    :param storage: 'file' or 'memory'
+    :param samples: maximum number of calls per operation
+    :param budget: maximum time in seconds per operation
+    :param seed: seed of the synthetic data => same data for the same parameters
+    :param directory: directory of the database file (temporary directory if None)
+    :param profile: tuning profile of the database => see PRAGMA_PROFILES
+    :return: dictionary {'schema', 'size', 'storage', 'load', 'operations': {<operation>: statistics}}
+    """
+    rand = random.Random(seed)
+    if storage == 'memory':
+        databaseName = ':memory:'
+    else:
+        directory = directory or tempfile.mkdtemp(prefix="sql_benchmark")
+        databaseName = os.path.join(directory, "%s_%d.db" % (schema, size))
+        if os.path.exists(databaseName):
+            os.remove(databaseName)
+
+    database = SQLDatabase(databaseName=databaseName, profile=profile)
+    table = SQLTable(SQLdbObj=database, tableName=schema, **SCHEMAS[schema])
+    table.define_filter_for_insertion(['name'])
+
+    # Load
+    start = time.perf_counter()
+    inserted, rejected = table.insert_many(make_row(schema, i, rand) for i in range(size))
+    database.commit()
+    load = {'rows': inserted, 'rejected': len(rejected), 'seconds': time.perf_counter() - start}
+
+    existing = [make_row(schema, rand.randrange(size), rand)['name'] for i in range(samples)] if size else []
+    operations = {}
+
+    # New rows, committed once at the end (as the demo)
+    operations['insert'] = measure(lambda row: table.insert(**row),
+                                   [make_row(schema, size + i, rand) for i in range(samples)], budget)
+    database.commit()
+
+    operations['select_one'] = measure(lambda name: table.select_one(name=name), existing, budget)
+    operations['select_all'] = measure(lambda i: table.select_all(), range(max(1, samples // 20)), budget)
+
+    if schema == 'Cars':
+        operations['modify'] = measure(lambda name: table.modify(name=name, color=rand.choice(COLORS)),
+                                       existing, budget)
+    else:
+        operations['modify'] = measure(lambda name: table.modify(name=name, calory=rand.randint(0, 10000)),
+                                       existing, budget)
+    database.commit()
+
+    # Delete distinct rows: the ones inserted by the insert measure
+    victims = [make_row(schema, size + i, rand)['name'] for i in range(samples)]
+    operations['delete'] = measure(lambda name: table.delete(name=name), victims, budget)
+    database.commit()
+
+    database.close()
+    if storage == 'file':
+        os.remove(databaseName)
+
+    return {'schema': schema, 'size': size, 'storage': storage, 'profile': profile, 'load': load,
+            'operations': operations}
+
+
+def run(sizes=None, storages=None, schemas=None, samples=200, budget=10.0, seed=0, directory=None, profile=None):
+    """
+    Run the benchmark on every combination of schema, size and storage
+
+    :return: dictionary {'environment': ..., 'parameters': ..., 'results': {<schema>/<storage>/<size>: case}}
+    """
+    sizes = sizes or DEFAULT_SIZES
+    storages = storages or DEFAULT_STORAGES
+    schemas = schemas or list(SCHEMAS)
+
+    results = {}
+    for schema in schemas:
+        for storage in storages:
+            for size in sizes:
+                key = "%s/%s/%d" % (schema, storage, size)
+                print("Benchmark " + key, file=sys.stderr)
+                results[key] = bench_case(schema, size, storage, samples=samples, budget=budget, seed=seed,
+                                          directory=directory, profile=profile)
+
+    return {'environment': {'python': platform.python_version(), 'sqlite': sqlite3.sqlite_version,
+                            'platform': platform.platform(), 'date': time.strftime("%Y-%m-%dT%H:%M:%S")},
+            'parameters': {'sizes': sizes, 'storages': storages, 'schemas': schemas, 'samples': samples,
+                           'budget': budget, 'seed': seed, 'profile': profile},
+            'results': results}
+
+
+def compare(baseline, candidate, threshold=0.10):
+    """
+    Compare two benchmark results on the p50 / p99 latency of every common operation
+
+    :param baseline: result of run (reference)
+    :param candidate: result of run
+    :param threshold: relative change of the latency considered significant (0.10 => 10%)
+    :return: list of (case/operation, metric, baseline, candidate, ratio, 'regression'|'improvement'|'same')
+    """
+    report = []
+    for key, case in baseline['results'].items():
+        other = candidate['results'].get(key)
+        if other is None:
+            continue
+        for operation, stats in case['operations'].items():
+            otherStats = other['operations'].get(operation)
+            if otherStats is None:
+                continue
+            for metric in ('p50', 'p99'):
+                before, after = stats[metric], otherStats[metric]
+                if not before or after is None:
+                    continue
+                ratio = after / before
+                if ratio > 1 + threshold:
+                    verdict = 'regression'
+                elif ratio < 1 - threshold:
+                    verdict = 'improvement'
+                else:
+                    verdict = 'same'
+                report.append((key + "/" + operation, metric, before, after, ratio, verdict))
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark of the sqlite3 wrapper")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    runParser = commands.add_parser('run', help="run the benchmark, JSON results")
+    runParser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    runParser.add_argument('--storages', nargs='+', choices=DEFAULT_STORAGES, default=DEFAULT_STORAGES)
+    runParser.add_argument('--schemas', nargs='+', choices=list(SCHEMAS), default=list(SCHEMAS))
+    runParser.add_argument('--samples', type=int, default=200, help="maximum calls per operation")
+    runParser.add_argument('--budget', type=float, default=10.0, help="maximum seconds per operation")
+    runParser.add_argument('--seed', type=int, default=0)
+    runParser.add_argument('--directory', default=None, help="directory of the database files")
+    runParser.add_argument('--profile', choices=list(PRAGMA_PROFILES), default=None, help="PRAGMA profile")
+    runParser.add_argument('--output', '-o', default=None, help="JSON file (stdout if omitted)")
+
+    compareParser = commands.add_parser('compare', help="compare two JSON results")
+    compareParser.add_argument('baseline')
+    compareParser.add_argument('candidate')
+    compareParser.add_argument('--threshold', type=float, default=0.10)
+
+    args = parser.parse_args(argv)
+
+    # The wrapper logs every write at INFO level
+    logging.getLogger('SQLTable').setLevel(logging.WARNING)
+    logging.getLogger('SQLDatabase').setLevel(logging.WARNING)
+
+    if args.command == 'run':
+        result = run(args.sizes, args.storages, args.schemas, args.samples, args.budget, args.seed, args.directory,
+                     args.profile)
+        if args.output:
+            with open(args.output, 'w') as output:
+                json.dump(result, output, indent=2)
+        else:
+            json.dump(result, sys.stdout, indent=2)
+        return 0
+
+    with open(args.baseline) as baseline, open(args.candidate) as candidate:
+        report = compare(json.load(baseline), json.load(candidate), args.threshold)
+    for name, metric, before, after, ratio, verdict in report:
+        print("%-50s %-4s %12.1fus %12.1fus  x%.2f  %s" % (name, metric, before * 1e6, after * 1e6, ratio, verdict))
+    # Non-zero exit status on regression => usable in CI
+    return 1 if any(item[-1] == 'regression' for item in report) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -67,6 +67,14 @@ class SqlTableAlreadyExistError(Exception):
 class SqlNoItemToMoveError(Exception):
     pass
 
+
+class SqlPoolError(Exception):
+    pass
+
+
+class SqlAttachError(Exception):
+    pass
+
 # Warnings
 
 
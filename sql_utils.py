@@ -6,34 +6,75 @@
 # Description : Utils functions for SQL access
 ##############################################################################################
 
+import base64
+import csv
+import json
 import logging
+import threading
+import time
 import unicodedata
-import inspect
+from collections import OrderedDict
+from functools import lru_cache
 
 from sql_exception import *
 
+# Optional: vectorized conversion of numeric columns => see convert_column
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Minimum number of values in a column to use the vectorized conversion
+VECTORIZE_MIN_SIZE = 256
+
+# Number of non-ASCII values memoized by the 'noaccent' function => see NoAccent
+NOACCENT_CACHE_SIZE = 65536
+
+# Number of buckets of LatencyHistogram: bucket i counts the latencies lower than 2**i microseconds
+HISTOGRAM_BUCKETS = 32
+
+# Maximum number of distinct SQL texts timed by Metrics, the others are grouped under '<other>'
+METRICS_MAX_STATEMENTS = 512
+
+
+class FunctionFormatter(logging.Formatter):
+    """
+    Formatter displaying the function name given as LogRecord extra: [<logger name>.<functionName>]
+    """
+    def format(self, record):
+        if not hasattr(record, 'functionName'):
+            record.functionName = record.funcName
+        return super().format(record)
+
 
 class Logger:
+    """
+    Thin wrapper on logging.Logger: the handler is configured once per logger name (creating a Logger is cheap),
+    the function name travels with the record & messages are formatted lazily (%-style 'args')
+    only if the severity is enabled.
+    """
     def __init__(self, name, severity=logging.DEBUG):
         # create logger
         self.logger = logging.getLogger(name)
-        self.logger.setLevel(severity)
 
-        # create console handler and set level to debug
-        self.logger.handlers.clear()
-        self.ch = self.define_handler()
-        self.set_severity_level(self.ch)
+        # configure it only once: level & handler set by a previous Logger (or by the user) are kept
+        if self.logger.level == logging.NOTSET:
+            self.logger.setLevel(severity)
 
-        # create formatter
-        self.functionName = ""
-        self.formatter = logging.Formatter('%(asctime)s [%(name)s.' + self.functionName
-                                           + '] %(levelname)s - %(message)s')
+        if not self.logger.handlers:
+            # create console handler and set level to debug
+            self.ch = self.define_handler()
+            self.set_severity_level(self.ch)
 
-        # add formatter to ch
-        self.ch.setFormatter(self.formatter)
+            # create formatter & add it to ch
+            self.formatter = FunctionFormatter('%(asctime)s [%(name)s.%(functionName)s] %(levelname)s - %(message)s')
+            self.ch.setFormatter(self.formatter)
 
-        # add ch to logger
-        self.logger.addHandler(self.ch)
+            # add ch to logger
+            self.logger.addHandler(self.ch)
+        else:
+            self.ch = self.logger.handlers[0]
+            self.formatter = self.ch.formatter
 
     def define_handler(self):
         return logging.StreamHandler()
@@ -41,59 +82,489 @@ class Logger:
     def set_severity_level(self, handler, severityLevel=logging.DEBUG):
         handler.setLevel(severityLevel)
 
-    def change_formatter(self, functionName=""):
-        if self.functionName != functionName:
-            self.formatter = logging.Formatter('%(asctime)s [%(name)s.' + functionName
-                                               + '] %(levelname)s - %(message)s')
-            self.ch.setFormatter(self.formatter)
+    def isEnabledFor(self, severity):
+        return self.logger.isEnabledFor(severity)
 
-    def debug(self, functionName, message: str):
-        self.change_formatter(functionName)
-        self.logger.debug(message)
+    def debug(self, functionName, message: str, args=()):
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(message, *args, extra={'functionName': functionName})
 
-    def info(self, functionName, message: str):
-        self.change_formatter(functionName)
-        self.logger.info(message)
+    def info(self, functionName, message: str, args=()):
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(message, *args, extra={'functionName': functionName})
 
-    def warning(self, functionName, message: str):
-        self.change_formatter(functionName)
-        self.logger.warning(message)
+    def warning(self, functionName, message: str, args=()):
+        if self.logger.isEnabledFor(logging.WARNING):
+            self.logger.warning(message, *args, extra={'functionName': functionName})
 
-    def error(self, functionName, message: str):
-        self.change_formatter(functionName)
-        self.logger.error(message)
+    def error(self, functionName, message: str, args=()):
+        if self.logger.isEnabledFor(logging.ERROR):
+            self.logger.error(message, *args, extra={'functionName': functionName})
 
-    def critical(self, functionName, message: str):
-        self.change_formatter(functionName)
-        self.logger.critical(message)
+    def critical(self, functionName, message: str, args=()):
+        if self.logger.isEnabledFor(logging.CRITICAL):
+            self.logger.critical(message, *args, extra={'functionName': functionName})
 
 
-def sql_type(typename, value):
+# Module loggers => created once, not on every value checked
+SQLchecklog = Logger(name='Check_param_char')
+
+
+class StatementCache:
     """
-    To be completed (Only INTEGER and TEXT are defined)
+    Bounded LRU of SQL statements text, keyed by the shape of the operation (operation, parameters, ...).
+    The same text is returned for the same shape, so sqlite3 statement cache reuses the prepared statement.
+    """
+    def __init__(self, maxSize=128):
+        self.maxSize = maxSize
+        self.statements = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, builder):
+        """
+        Return the statement associated to a shape, build it if not cached
+
+        :param key: shape of the statement (hashable)
+        :param builder: function called without parameter to build the statement on cache miss
+        :return: SQL statement
+        """
+        statement = self.statements.get(key)
+        if statement is not None:
+            self.statements.move_to_end(key)
+            self.hits += 1
+            return statement
+
+        self.misses += 1
+        statement = self.statements[key] = builder()
+        if len(self.statements) > self.maxSize:
+            self.statements.popitem(last=False)
+        return statement
+
+    def clear(self):
+        self.statements.clear()
 
-    :param typename:
-    :param value:
-    :return: type
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self.statements), 'maxSize': self.maxSize}
+
+
+class ResultCache:
     """
-    log = Logger('SQL_type')
-    if 'INTEGER'.lower() in typename.lower():
-        return int(value)
-    elif 'FLOAT'.lower() in typename.lower():
-        return float(value)
-    elif 'TEXT'.lower() in typename.lower():
-        return str(value)
-    elif 'TIMESTAMP'.lower() in typename.lower():
-        return str(value)
-    elif 'TIME'.lower() in typename.lower():
+    Bounded LRU of query results with an optional time-to-live.
+    An entry is only returned for the version (of the table/database) it was computed with.
+    """
+    def __init__(self, maxSize=256, ttl=None):
+        self.maxSize = maxSize
+        self.ttl = ttl
+        self.results = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, version):
+        """
+        Return a copy of the cached result, None if not cached, expired or computed for another version
+
+        :param key: key of the query (hashable)
+        :param version: current version of the data
+        :return: list of rows or None
+        """
+        with self.lock:
+            entry = self.results.get(key)
+            if entry is not None:
+                stamp, entryVersion, rows = entry
+                if entryVersion == version and (self.ttl is None or time.monotonic() - stamp < self.ttl):
+                    self.results.move_to_end(key)
+                    self.hits += 1
+                    return list(rows)
+                del self.results[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, version, rows):
+        with self.lock:
+            self.results[key] = (time.monotonic(), version, tuple(rows))
+            self.results.move_to_end(key)
+            if len(self.results) > self.maxSize:
+                self.results.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.results.clear()
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self.results), 'maxSize': self.maxSize,
+                'ttl': self.ttl}
+
+
+class LatencyHistogram:
+    """
+    Latencies of an operation in power-of-two buckets (microseconds) => constant memory, approximate percentiles
+    """
+    def __init__(self):
+        self.buckets = [0] * HISTOGRAM_BUCKETS
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def record(self, seconds, error=False):
+        self.buckets[min(int(seconds * 1e6).bit_length(), HISTOGRAM_BUCKETS - 1)] += 1
+        self.count += 1
+        self.errors += error
+        self.total += seconds
+        if seconds > self.maximum:
+            self.maximum = seconds
+
+    def percentile(self, p):
+        """
+        Upper bound of the bucket holding the percentile 'p'
+
+        :param p: percentile (0-100)
+        :return: latency in seconds, None if empty
+        """
+        if not self.count:
+            return None
+        rank = p / 100.0 * self.count
+        cumulated = 0
+        for i, count in enumerate(self.buckets):
+            cumulated += count
+            if cumulated >= rank and count:
+                return min(2 ** i / 1e6, self.maximum)
+        return self.maximum
+
+    def snapshot(self):
+        return {'count': self.count, 'errors': self.errors, 'seconds': self.total,
+                'mean': self.total / self.count if self.count else None,
+                'p50': self.percentile(50), 'p99': self.percentile(99), 'max': self.maximum,
+                'buckets': {2 ** i: count for i, count in enumerate(self.buckets) if count}}
+
+
+class Metrics:
+    """
+    Counters & latency histograms of the operations and statements of a database => SQLDatabase.enable_metrics
+    """
+    def __init__(self, slowQuery=None, logger=None):
+        """
+        :param slowQuery: threshold in seconds above which a statement is logged as slow, None to disable
+        :param logger: Logger used for slow statements
+        """
+        self.slowQuery = slowQuery
+        self.logger = logger
+        self.lock = threading.Lock()
+        self.local = threading.local()                                   # Statement running in the current thread
+        self.operations = {}                                             # <table>.<method> => LatencyHistogram
+        self.statements = {}                                             # SQL text => LatencyHistogram
+        self.executed = {}                                               # Statement verb => count (trace callback)
+        self.slowQueries = 0
+
+    def operation(self, name, seconds, error=False):
+        with self.lock:
+            histogram = self.operations.get(name)
+            if histogram is None:
+                histogram = self.operations[name] = LatencyHistogram()
+            histogram.record(seconds, error)
+
+    def begin(self, sql):
+        """
+        Mark the start of a statement in the current thread => see progress
+        """
+        self.local.running = (sql, time.perf_counter())
+
+    def statement(self, sql, binds, seconds, error=False):
+        """
+        Record the execution of a statement, log it if slower than the threshold
+
+        :param sql: SQL text
+        :param binds: number of bind parameters
+        :param seconds: execution time
+        :param error: True if the statement raised
+        :return: None
+        """
+        self.local.running = None
+        with self.lock:
+            histogram = self.statements.get(sql)
+            if histogram is None:
+                if len(self.statements) >= METRICS_MAX_STATEMENTS:
+                    sql = '<other>'
+                histogram = self.statements.setdefault(sql, LatencyHistogram())
+            histogram.record(seconds, error)
+            slow = self.slowQuery is not None and seconds >= self.slowQuery
+            self.slowQueries += slow
+        if slow and self.logger is not None:
+            self.logger.warning(functionName="statement",
+                                message="Slow query (%.1f ms, %d bind parameters): %s",
+                                args=(seconds * 1000, binds, sql))
+
+    def trace(self, sql):
+        """
+        Trace callback of the connections: count every statement run by SQLite (implicit BEGIN/COMMIT included)
+        """
+        verb = sql.lstrip().split(' ', 1)[0].upper()
+        with self.lock:
+            self.executed[verb] = self.executed.get(verb, 0) + 1
+
+    def progress(self):
+        """
+        Progress handler of the connections: log once a statement still running above the slow threshold
+
+        :return: 0 => never interrupt the statement
+        """
+        running = getattr(self.local, 'running', None)
+        if running is not None and time.perf_counter() - running[1] >= self.slowQuery:
+            self.local.running = None
+            if self.logger is not None:
+                self.logger.warning(functionName="progress",
+                                    message="Query still running after %.1f ms: %s",
+                                    args=(self.slowQuery * 1000, running[0]))
+        return 0
+
+    def snapshot(self):
+        with self.lock:
+            return {'operations': {name: h.snapshot() for name, h in self.operations.items()},
+                    'statements': {sql: h.snapshot() for sql, h in self.statements.items()},
+                    'executed': dict(self.executed),
+                    'slowQueries': self.slowQueries}
+
+
+class RejectFile:
+    """
+    Sidecar file of the rows rejected by an import, opened on the first reject
+    """
+    def __init__(self, path, csvFormat=True, encoding='utf-8'):
+        """
+        :param path: file to write
+        :param csvFormat: True => CSV (original fields + '_line' + '_error'), False => JSON Lines
+        :param encoding: encoding of the file
+        """
+        self.path = path
+        self.csvFormat = csvFormat
+        self.encoding = encoding
+        self.header = None                                               # Original CSV header
+        self.output = None
+        self.writer = None
+        self.count = 0
+
+    def write(self, line, record, error):
+        """
+        :param line: line number in the imported file
+        :param record: original record (list of fields for CSV, object or text for JSONL)
+        :param error: reason of the reject
+        """
+        if self.output is None:
+            self.output = open(self.path, 'w', newline='' if self.csvFormat else None, encoding=self.encoding)
+            if self.csvFormat:
+                self.writer = csv.writer(self.output)
+                self.writer.writerow(list(self.header or []) + ['_line', '_error'])
+        if self.csvFormat:
+            self.writer.writerow(list(record) + [line, error])
+        else:
+            self.output.write(json.dumps({'line': line, 'error': error, 'record': record}, default=str) + "\n")
+        self.count += 1
+
+    def close(self):
+        if self.output is not None:
+            self.output.close()
+
+
+def encode_page_token(state):
+    """
+    Opaque cursor of SQLTable.page: url-safe base64 of the JSON state (bytes values are tagged)
+
+    :param state: list of JSON values or bytes
+    :return: token (str)
+    """
+    state = [{'bytes': base64.b64encode(val).decode()} if isinstance(val, (bytes, bytearray, memoryview)) else val
+             for val in state]
+    return base64.urlsafe_b64encode(json.dumps(state, separators=(',', ':')).encode()).decode()
+
+
+def decode_page_token(token):
+    """
+    Reverse of encode_page_token
+
+    :param token: token returned by SQLTable.page
+    :return: list of values
+    """
+    try:
+        state = json.loads(base64.urlsafe_b64decode(token.encode()).decode())
+        if not isinstance(state, list):
+            raise ValueError("list expected")
+        return [base64.b64decode(val['bytes']) if isinstance(val, dict) else val for val in state]
+    except (ValueError, AttributeError, KeyError, TypeError):
+        raise ValueError("Invalid page token: " + repr(token))
+
+
+def sql_numeric(value):
+    """
+    Converter of NUMERIC affinity: numbers, NULL & blobs are kept, text is converted to INTEGER if possible,
+    REAL otherwise, and stored unchanged if it is not a number (ex: '2020-01-01' in a DATE column)
+
+    :param value: value to convert
+    :return: int, float, str, None or bytes-like value
+    """
+    if value is None or isinstance(value, (int, float, bytes, bytearray, memoryview)):
+        return value
+    value = str(value)
+    try:
         return int(value)
+    except ValueError:
+        try:
+            return float(value)
+        except ValueError:
+            return value
+
+
+def sql_blob(value):
+    """
+    Converter of BLOB type: only bytes-like values are accepted
+
+    :param value: value to convert
+    :return: bytes-like value
+    """
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return value
+    raise TypeError(str(type(value).__name__) + " is not a BLOB")
+
+
+def sql_none(value):
+    """
+    Converter of column without type (BLOB affinity): value is stored as is if SQLite can store it
+
+    :param value: value to convert
+    :return: value
+    """
+    if value is None or isinstance(value, (int, float, str, bytes, bytearray, memoryview)):
+        return value
+    raise TypeError(str(type(value).__name__) + " cannot be stored in SQLite")
+
+
+def sql_converter(typename):
+    """
+    Return the python converter associated to a SQL type:
+        - INTEGER, FLOAT, TEXT, TIMESTAMP, TIME as historically defined
+        - otherwise the SQLite affinity rules: INT => int, CHAR/CLOB/TEXT => str, BLOB => bytes,
+          REAL/FLOA/DOUB => float, no type => any value, else NUMERIC
+
+    :param typename: SQL type declared at the creation of the table
+    :return: converter (callable)
+    """
+    typename = typename.lower()
+    if 'INTEGER'.lower() in typename:
+        return int
+    elif 'FLOAT'.lower() in typename:
+        return float
+    elif 'TEXT'.lower() in typename:
+        return str
+    elif 'TIMESTAMP'.lower() in typename:
+        return str
+    elif 'TIME'.lower() in typename:
+        return int
+    # SQLite affinity rules
+    elif 'int' in typename:
+        return int
+    elif 'char' in typename or 'clob' in typename:
+        return str
+    elif 'blob' in typename:
+        return sql_blob
+    elif 'real' in typename or 'floa' in typename or 'doub' in typename:
+        return float
+    elif not typename.strip() or typename.strip().startswith('primary key'):
+        return sql_none
     else:
-        log.critical(functionName=str(inspect.stack()[-5][3]), message="Type Unknown")
-        raise TypeError(str(typename) + " is an Unknown Type: Check sql_type function in SQL/sql_utils.py")
+        return sql_numeric
+
+
+def compile_converters(ref_param):
+    """
+    Compile the converter of every parameter of a table once => SQLTable.converters
+
+    :param ref_param: dictionary of {param_name : param_type}
+    :return: dictionary of {param_name : converter}
+    """
+    return {key: sql_converter(val) for key, val in ref_param.items()}
+
+
+def convert_column(converter, values):
+    """
+    Convert all the values of one parameter at once.
+    Numeric values of INTEGER/REAL parameters are converted by NumPy if installed, only when the result is
+    exactly the one of the python converter (ex: int & float mixed in an INTEGER parameter => python int()).
+
+    :param converter: converter of the parameter => see sql_converter
+    :param values: list of values
+    :return: list of converted values
+    """
+    if numpy is not None and converter in (int, float) and len(values) >= VECTORIZE_MIN_SIZE:
+        try:
+            array = numpy.asarray(values)
+        except (ValueError, OverflowError):
+            array = None
+        # Only pure numeric input is vectorized (None, bool, text, ... keep the python semantics)
+        if array is not None and array.ndim == 1:
+            if converter is float and array.dtype.kind in 'iuf':
+                return array.astype(numpy.float64).tolist()
+            if converter is int and array.dtype.kind == 'i':
+                return array.tolist()
+    return [converter(val) for val in values]
+
+
+def column_dtype(converter):
+    """
+    NumPy dtype of a parameter => SQLTable.select_columns / SQLTable.to_numpy
+
+    :param converter: converter of the parameter => see sql_converter
+    :return: int64 (INTEGER), float64 (REAL), object otherwise (text, blob, untyped)
+    """
+    if converter is int:
+        return numpy.dtype(numpy.int64)
+    if converter is float:
+        return numpy.dtype(numpy.float64)
+    return numpy.dtype(object)
+
 
+def fill_column(array, start, values):
+    """
+    Copy a chunk of values into a preallocated column.
+    If a value does not fit its dtype, the column is upgraded: NULL of a numeric column => float64 with NaN,
+    anything else (ex: text stored in an INTEGER column) => object.
 
-def check_param_char(ref_param, test_param, test='111'):
-    log = Logger(name='Check_param_char')
+    :param array: 1-D NumPy array
+    :param start: index of the first value
+    :param values: sequence of values
+    :return: the array, or its upgraded copy
+    """
+    end = start + len(values)
+    try:
+        array[start:end] = values
+        return array
+    except (TypeError, ValueError, OverflowError):
+        pass
+    if array.dtype.kind in 'iuf':
+        upgraded = array.astype(numpy.float64)
+        try:
+            upgraded[start:end] = [numpy.nan if val is None else val for val in values]
+            return upgraded
+        except (TypeError, ValueError, OverflowError):
+            pass
+    upgraded = array.astype(object)
+    upgraded[start:end] = values
+    return upgraded
+
+
+def sql_type(typename, value):
+    """
+    Convert a value to the python type of a SQL type => see sql_converter
+
+    :param typename: SQL type declared at the creation of the table
+    :param value: value to convert
+    :return: converted value
+    """
+    return sql_converter(typename)(value)
+
+
+def check_param_char(ref_param, test_param, test='111', converters=None):
+    log = SQLchecklog
 
     #####################################################################################################
     # check the length of parameter
@@ -124,7 +595,10 @@ def check_param_char(ref_param, test_param, test='111'):
     if test[2] == '1':
         for key, val in test_param.items():
             try:
-                test_param[key] = sql_type(ref_param[key], val)
+                if converters is None:
+                    test_param[key] = sql_type(ref_param[key], val)
+                else:
+                    test_param[key] = converters[key](val)
             except:
                 # raise Exception
                 raise SqlTypeParameterError("parameterName = " + str(key) +
@@ -132,6 +606,68 @@ def check_param_char(ref_param, test_param, test='111'):
                                             " | get : " + str(type(val).__name__))
 
 
+def check_batch_char(ref_param, rows, converters=None):
+    """
+    Batch version of check_param_char: validate a list of rows against the table parameters at once.
+    Types are converted column by column (see convert_column) and the rows given by the caller are NOT mutated.
+    'id' parameter is automatically incremented: optional in a dict row, never converted nor returned.
+
+    :param ref_param: parameters @ creation of the table
+    :param rows: list of (index, row), row being a dict or a tuple ordered as ref_param
+    :param converters: compiled converters of the table (see compile_converters), compiled here if None
+    :return: (list of (index, converted dict), list of (index, error message))
+    """
+    keys = [key for key in ref_param.keys() if key != 'id']
+    refLength = len(ref_param)
+    if converters is None:
+        converters = compile_converters(ref_param)
+    checked = []
+    rejected = {}
+
+    #####################################################################################################
+    # Check length & name of parameters of each row
+    for idx, row in rows:
+        try:
+            if not isinstance(row, dict):
+                row = tuple(row)
+                if len(row) != refLength:
+                    raise SqlLengthParameterError("ref_param = " + str(refLength) + " | test_param = " + str(len(row)))
+                row = dict(zip(ref_param.keys(), row))
+            elif len(row) != (refLength if 'id' in row else len(keys)):
+                raise SqlLengthParameterError("ref_param = " + str(refLength) + " | test_param = " + str(len(row)))
+
+            for key in row:
+                if key not in converters:
+                    raise SqlNameParameterError("This parameter does not exist in the SQL table " + str(key))
+            checked.append((idx, row))
+
+        except (SqlLengthParameterError, SqlNameParameterError) as e:
+            rejected[idx] = e.args[0]
+
+    #####################################################################################################
+    # Check the type of each parameter, column by column
+    columns = {}
+    for key in keys:
+        values = [row[key] for idx, row in checked]
+        try:
+            columns[key] = convert_column(converters[key], values)
+        except:
+            # Find the faulty values
+            columns[key] = []
+            for (idx, row), val in zip(checked, values):
+                try:
+                    columns[key].append(converters[key](val))
+                except:
+                    columns[key].append(None)
+                    rejected.setdefault(idx, "parameterName = " + str(key) +
+                                             " | exp = " + str(ref_param[key]) +
+                                             " | get : " + str(type(val).__name__))
+
+    valid = [(idx, {key: columns[key][pos] for key in keys})
+             for pos, (idx, row) in enumerate(checked) if idx not in rejected]
+    return valid, sorted(rejected.items())
+
+
 def check_for_double_items(param, table, query_info, auth):
     double_list = []
     indice = []
@@ -166,3 +702,37 @@ def check_for_double_items(param, table, query_info, auth):
 
 def translate_no_accent_nocase_sensitive(string_exemple):
     return str(unicodedata.normalize('NFKD', str(string_exemple)).encode('ASCII', 'ignore'), 'utf-8').lower()
+
+
+class NoAccent:
+    """
+    'noaccent' SQL function = translate_no_accent_nocase_sensitive with:
+        - an ASCII fast path: ASCII text is not changed by the normalization, only lowered
+        - a bounded LRU memo for the other values (low-cardinality columns are normalized once)
+    """
+    def __init__(self, maxSize=NOACCENT_CACHE_SIZE):
+        self.asciiCalls = 0
+        self.translate = lru_cache(maxsize=maxSize)(translate_no_accent_nocase_sensitive)
+
+    def __call__(self, value):
+        string = value if isinstance(value, str) else str(value)
+        if string.isascii():
+            self.asciiCalls += 1
+            return string.lower()
+        return self.translate(string)
+
+    def stats(self):
+        """
+        Statistics of the function: calls on the ASCII fast path, memo hits/misses & hit rate
+
+        :return: dictionary {'ascii': ..., 'hits': ..., 'misses': ..., 'size': ..., 'maxSize': ..., 'hitRate': ...}
+        """
+        info = self.translate.cache_info()
+        calls = self.asciiCalls + info.hits + info.misses
+        return {'ascii': self.asciiCalls, 'hits': info.hits, 'misses': info.misses,
+                'size': info.currsize, 'maxSize': info.maxsize,
+                'hitRate': (self.asciiCalls + info.hits) / calls if calls else 0.0}
+
+
+# Shared by every connection & by the values normalized in python
+noaccent = NoAccent()
@@ -0,0 +1,708 @@
+##############################################################################################
+# Project     : sqlite3 wrapper
+# File        : test_sql_access.py
+# Author      : Remi Malaquin
+# Date        : 01/17/2018
+# Description : Regression tests of SQLDatabase & SQLTable (python -m unittest).
+##############################################################################################
+
+import asyncio
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from sql_access import *
+from sql_async import *
+
+
+class InsertTest(unittest.TestCase):
+    """
+    insert & insert_many with a filter for insertion
+    """
+
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+        self.db = SQLDatabase(databaseName=':memory:')
+        self.table = SQLTable(SQLdbObj=self.db, tableName='Cars', name='TEXT', brand='TEXT')
+        self.table.define_filter_for_insertion(['name', 'brand'])
+
+    def tearDown(self):
+        self.db.close()
+        logging.disable(logging.NOTSET)
+
+    def test_insert_keeps_substring_research(self):
+        self.table.insert(name='i8', brand='BMW')
+        self.table.insert(auth=True, name='i8', brand='Tesla')
+        self.table.insert(auth=True, name='I8 x', brand='BMW')
+        with self.assertRaises(SqlDoubleItemsOccurs):
+            self.table.insert(name='I8', brand='bmw')
+        self.assertEqual(len(self.table.select_all()), 3)
+
+    def test_insert_many_rejects_normalized_doubles(self):
+        self.table.insert(name='Été', brand='Renault')
+        inserted, rejected = self.table.insert_many([{'name': 'ete', 'brand': 'Peugeot'},
+                                                     {'name': 'Zoé', 'brand': 'Renault'},
+                                                     {'name': 'Zoé', 'brand': 'Tesla'},
+                                                     {'name': 'ZOE', 'brand': 'TESLA'}], auth=True)
+        self.assertEqual(inserted, 3)
+        self.assertEqual(rejected, [(3, "Item already exist in the database")])
+
+    def test_insert_many_any_filter_key(self):
+        self.table.insert(name='Été', brand='Renault')
+        inserted, rejected = self.table.insert_many([('ete', 'Peugeot'), ('Zoé', 'Tesla'), ('Mégane', 'tesla')])
+        self.assertEqual((inserted, [idx for idx, reason in rejected]), (1, [0, 2]))
+
+    def test_no_function_index_by_default(self):
+        self.table.insert_many([('Zoé', 'Renault')])
+        self.db.cursor.execute("SELECT sql FROM sqlite_master WHERE type='index' AND sql IS NOT NULL")
+        self.assertEqual(self.db.cursor.fetchall(), [])
+        self.db.cursor.execute("SELECT name FROM sqlite_temp_master")
+        self.assertEqual(self.db.cursor.fetchall(), [])
+
+
+class ConverterTest(unittest.TestCase):
+    """
+    Converters compiled from the declared types of the parameters
+    """
+
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+        self.db = SQLDatabase(databaseName=':memory:')
+        self.table = SQLTable(SQLdbObj=self.db, tableName='Events', name='TEXT', created='DATE', amount='NUMERIC',
+                              count='INTEGER')
+
+    def tearDown(self):
+        self.db.close()
+        logging.disable(logging.NOTSET)
+
+    def test_numeric_affinity(self):
+        self.table.insert(name='a', created='2020-01-01', amount='12', count='3')
+        self.table.insert(name='b', created=None, amount=None, count=4)
+        self.table.insert_many([('c', '2021', '1.5', 5), ('d', None, b'raw', 6)])
+        self.assertEqual(self.table.select_all(), [('a', '2020-01-01', 12, 3), ('b', None, None, 4),
+                                                   ('c', 2021, 1.5, 5), ('d', None, b'raw', 6)])
+
+    def test_type_error(self):
+        with self.assertRaises(SqlTypeParameterError):
+            self.table.insert(name='a', created='2020-01-01', amount=1, count='three')
+        inserted, rejected = self.table.insert_many([('b', None, 1, 'three')])
+        self.assertEqual(rejected, [(0, "parameterName = count | exp = INTEGER | get : str")])
+
+    def test_convert_column_is_exact(self):
+        values = [2 ** 53 + 1] * VECTORIZE_MIN_SIZE + [1.0]
+        self.assertEqual(convert_column(int, values), [2 ** 53 + 1] * VECTORIZE_MIN_SIZE + [1])
+        self.assertEqual(convert_column(float, [1, 2.5] * VECTORIZE_MIN_SIZE), [1.0, 2.5] * VECTORIZE_MIN_SIZE)
+        self.assertEqual(sql_numeric(None), None)
+
+
+class UniqueFilterTest(unittest.TestCase):
+    """
+    Filter for insertion backed by UNIQUE indexes
+    """
+
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+        self.db = SQLDatabase(databaseName=':memory:')
+        self.table = SQLTable(SQLdbObj=self.db, tableName='Cars', name='TEXT PRIMARY KEY', brand='TEXT')
+
+    def tearDown(self):
+        self.db.close()
+        logging.disable(logging.NOTSET)
+
+    def indexes(self):
+        self.db.cursor.execute("SELECT name FROM sqlite_master WHERE type='index' AND name LIKE 'Cars__unique%'")
+        return sorted(name for name, in self.db.cursor.fetchall())
+
+    def test_normalized_unique_index(self):
+        self.table.define_filter_for_insertion(['name'], unique=True)
+        self.table.insert(name='Mégane', brand='Renault')
+        with self.assertRaises(SqlDoubleItemsOccurs):
+            self.table.insert(name='megane', brand='Renault')
+        inserted, rejected = self.table.insert_many([('MEGANE', 'Renault'), ('Zoé', 'Renault')])
+        self.assertEqual((inserted, [idx for idx, reason in rejected]), (1, [0]))
+
+    def test_raw_unique_index(self):
+        self.table.define_filter_for_insertion(['brand'], unique=True, normalized=False)
+        self.table.insert(name='Mégane', brand='Renault')
+        self.table.insert(name='Clio', brand='renault')
+        with self.assertRaises(SqlDoubleItemsOccurs):
+            self.table.insert(name='Zoé', brand='Renault')
+
+    def test_redefinition_drops_previous_indexes(self):
+        self.table.define_filter_for_insertion(['name', 'brand'], unique=True)
+        self.assertEqual(self.indexes(), ['Cars__unique_brand', 'Cars__unique_name'])
+        self.table.define_filter_for_insertion(['name', 'brand'], unique=True, auth=True)
+        self.assertEqual(self.indexes(), ['Cars__unique_name_brand'])
+        self.table.define_filter_for_insertion(['name'])
+        self.assertEqual(self.indexes(), [])
+        self.table.insert(name='Mégane', brand='Renault')
+        self.table.insert(name='Clio', brand='Renault')
+
+    def test_primary_key_conflict(self):
+        self.table.define_filter_for_insertion(['brand'], unique=True)
+        self.table.define_filter_for_insertion(['brand'])
+        self.table.insert(name='Clio', brand='Renault')
+        with self.assertRaises(SqlDoubleItemsOccurs):
+            self.table.insert(name='Clio', brand='Peugeot')
+
+
+class UpsertTest(unittest.TestCase):
+    """
+    upsert & modify_many through the exact primary key
+    """
+
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+        self.db = SQLDatabase(databaseName=':memory:')
+        self.table = SQLTable(SQLdbObj=self.db, tableName='Cars', name='TEXT PRIMARY KEY', brand='TEXT',
+                              price='INTEGER')
+        self.table.insert_many([('Clio', 'Renault', 10), ('Clio 2', 'Dacia', 12), ('208', 'Peugeot', 15)])
+
+    def tearDown(self):
+        self.db.close()
+        logging.disable(logging.NOTSET)
+
+    def test_upsert(self):
+        self.assertEqual(self.table.upsert(name='Clio', price=11), 1)
+        self.assertEqual(self.table.upsert(name='Zoe', brand='Tesla', price=30), 1)
+        self.assertEqual(self.table.upsert(name='208'), 0)
+        self.assertEqual(sorted(self.table.select_all()),
+                         [('208', 'Peugeot', 15), ('Clio', 'Renault', 11), ('Clio 2', 'Dacia', 12),
+                          ('Zoe', 'Tesla', 30)])
+
+    def test_upsert_without_primary_key(self):
+        with self.assertRaises(SqlMissingPrimaryKey):
+            self.table.upsert(brand='Renault')
+
+    def test_upsert_unique_conflict(self):
+        self.table.define_filter_for_insertion(['brand'], unique=True, normalized=False)
+        self.table.upsert(name='208', price=16)
+        with self.assertRaises(SqlDoubleItemsOccurs):
+            self.table.upsert(name='3008', brand='Peugeot')
+
+    def test_modify_many_exact_key(self):
+        # 'Clio' is NOT researched as a pattern => 'Clio 2' is untouched, 'Unknown' is not counted
+        self.assertEqual(self.table.modify_many([{'name': 'Clio', 'price': 9},
+                                                 {'name': '208', 'brand': 'PSA', 'price': 14},
+                                                 {'name': 'Unknown', 'price': 1}]), 2)
+        self.assertEqual(sorted(self.table.select_all()),
+                         [('208', 'PSA', 14), ('Clio', 'Renault', 9), ('Clio 2', 'Dacia', 12)])
+
+    def test_modify_many_rolls_back(self):
+        with self.assertRaises(SqlMissingPrimaryKey):
+            self.table.modify_many([{'name': 'Clio', 'price': 9}, {'price': 1}])
+        self.table.define_filter_for_insertion(['brand'], unique=True, normalized=False)
+        with self.assertRaises(SqlDoubleItemsOccurs):
+            self.table.modify_many([{'name': 'Clio', 'price': 9}, {'name': '208', 'brand': 'Renault'}])
+        self.assertIn(('Clio', 'Renault', 10), self.table.select_all())
+
+
+class TransactionTest(unittest.TestCase):
+    """
+    SQLDatabase.transaction / savepoint nesting & group-commit policy
+    """
+
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+        self.directory = tempfile.mkdtemp(prefix="test_sql_access")
+        self.path = os.path.join(self.directory, "transaction.db")
+        self.db = SQLDatabase(databaseName=self.path)
+        self.table = SQLTable(SQLdbObj=self.db, tableName='Items', name='TEXT')
+        self.db.commit()
+
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.directory)
+        logging.disable(logging.NOTSET)
+
+    def names(self):
+        return [name for name, in self.table.select_all()]
+
+    def test_commit_and_rollback(self):
+        with self.db.transaction():
+            self.table.insert(name='a')
+        self.assertFalse(self.db.base.in_transaction)
+        with self.assertRaises(KeyError):
+            with self.db.transaction():
+                self.table.insert(name='b')
+                raise KeyError('rollback')
+        self.assertEqual(self.names(), ['a'])
+
+    def test_nested_block_rolled_back_alone(self):
+        with self.db.transaction():
+            self.table.insert(name='outer')
+            with self.assertRaises(KeyError):
+                with self.db.transaction():
+                    self.table.insert(name='inner')
+                    raise KeyError('rollback')
+            with self.db.savepoint():
+                self.table.insert(name='savepoint')
+        self.assertEqual(self.names(), ['outer', 'savepoint'])
+
+    def test_failed_transaction_keeps_pending_changes(self):
+        self.db.group_commit(rows=1000)
+        self.table.insert(name='pending')
+        with self.assertRaises(KeyError):
+            with self.db.transaction():
+                self.table.insert(name='lost')
+                raise KeyError('rollback')
+        self.assertEqual(self.names(), ['pending'])
+
+    def test_group_commit_counts_statement_rows(self):
+        self.table.define_normalized_keys(['name'])
+        self.table.define_fulltext_keys(['name'])
+        self.db.commit()
+        self.db.group_commit(rows=3)
+        self.table.insert(name='a')
+        self.table.insert(name='b')
+        self.assertTrue(self.db.base.in_transaction)            # Rows changed by the triggers are not counted
+        self.table.insert(name='c')
+        self.assertFalse(self.db.base.in_transaction)
+        self.table.insert_many([('d',), ('e',), ('f',)])
+        self.assertFalse(self.db.base.in_transaction)
+
+    def test_group_commit_on_close(self):
+        self.db.group_commit(milliseconds=60000)
+        self.table.insert(name='a')
+        self.assertTrue(self.db.base.in_transaction)
+        self.db.close()
+        self.db = SQLDatabase(databaseName=self.path)
+        self.table = SQLTable(SQLdbObj=self.db, tableName='Items', name='TEXT')
+        self.assertEqual(self.names(), ['a'])
+
+
+class PoolTest(unittest.TestCase):
+    """
+    Pooled mode: one writer connection & reader connections shared between threads (WAL)
+    """
+
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+        self.directory = tempfile.mkdtemp(prefix="test_sql_access")
+        self.db = SQLDatabase(databaseName=os.path.join(self.directory, "pool.db"), readers=1)
+        self.table = SQLTable(SQLdbObj=self.db, tableName='Items', name='TEXT')
+        self.table.insert_many([('a',), ('b',), ('c',)])
+        self.db.commit()
+
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.directory)
+        logging.disable(logging.NOTSET)
+
+    def test_memory_database_cannot_be_pooled(self):
+        with self.assertRaises(SqlPoolError):
+            SQLDatabase(databaseName=':memory:', readers=1)
+
+    def test_readers_see_committed_rows_only(self):
+        self.table.insert(name='d')
+        self.assertEqual(len(self.table.select_all()), 3)
+        with self.db.writer():
+            self.assertEqual(len(self.table.select_all()), 4)          # Writing thread sees its own rows
+        self.db.commit()
+        self.assertEqual(len(self.table.select_all()), 4)
+
+    def test_reader_checkout_is_reentrant(self):
+        names = [self.table.select_one(name=name)[0][0] for name, in self.table.iter_all()]
+        self.assertEqual(names, ['a', 'b', 'c'])
+
+    def test_reader_released_to_other_threads(self):
+        iterator = self.table.iter_all()
+        next(iterator)
+        counts = []
+        thread = threading.Thread(target=lambda: counts.append(len(self.table.select_all())))
+        thread.start()
+        self.assertEqual(len(list(iterator)), 2)
+        thread.join(10)
+        self.assertEqual(counts, [3])
+
+    def test_concurrent_writers(self):
+        def write(prefix):
+            for i in range(20):
+                self.table.insert(name=prefix + str(i))
+                self.db.commit()
+
+        threads = [threading.Thread(target=write, args=(prefix,)) for prefix in 'xyz']
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(30)
+        self.assertEqual(len(self.table.select_all()), 63)
+
+    def test_close_with_live_iterator(self):
+        iterator = self.table.iter_all()
+        next(iterator)
+        self.db.close()
+        with self.assertRaises(sqlite3.ProgrammingError):
+            list(iterator)
+
+
+class AsyncTest(unittest.TestCase):
+    """
+    asyncio facade: AsyncSQLDatabase / AsyncSQLTable
+    """
+
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+        self.directory = tempfile.mkdtemp(prefix="test_sql_access")
+        self.path = os.path.join(self.directory, "async.db")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+        logging.disable(logging.NOTSET)
+
+    def run_async(self, coroutine):
+        return asyncio.run(asyncio.wait_for(coroutine, 30))
+
+    def test_coalesced_writes_and_failures(self):
+        async def scenario():
+            db = AsyncSQLDatabase(self.path, maxPending=10)
+            table = AsyncSQLTable(db, 'Items', name='TEXT', count='INTEGER')
+            await table.define_filter_for_insertion(['name'], unique=True)
+            results = await asyncio.gather(*[table.insert(name='n' + str(i), count=i) for i in range(50)],
+                                           table.insert(name='N1', count=1), return_exceptions=True)
+            rows = await table.select_all()
+            names = [name async for name, count in table.iter_all(batchSize=7)]
+            await db.close()
+            return results, rows, names
+
+        results, rows, names = self.run_async(scenario())
+        self.assertEqual(results[:50], [None] * 50)
+        self.assertIsInstance(results[50], SqlDoubleItemsOccurs)
+        self.assertEqual(len(rows), 50)
+        self.assertEqual(len(names), 50)
+
+        # Written into the file (autoCommit)
+        db = SQLDatabase(self.path)
+        self.assertEqual(len(db.open_table('Items').select_all()), 50)
+        db.close()
+
+    def test_existing_table_and_manual_commit(self):
+        async def scenario():
+            db = AsyncSQLDatabase(self.path, autoCommit=False)
+            table = AsyncSQLTable(db, 'Items', name='TEXT')
+            await table.insert_many([('a',), ('b',)])
+            await db.commit()
+            await table.insert(name='c')
+            await db.close()
+
+            db = AsyncSQLDatabase(self.path)
+            rows = await AsyncSQLTable(db, 'Items').select_all()
+            await db.close()
+            return rows
+
+        self.assertEqual(self.run_async(scenario()), [('a',), ('b',)])
+
+
+class PooledResultCacheTest(unittest.TestCase):
+    """
+    Result cache of a pooled database (reads done by the reader connections)
+    """
+
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+        self.directory = tempfile.mkdtemp(prefix="test_sql_access")
+        self.db = SQLDatabase(databaseName=os.path.join(self.directory, "pool.db"), readers=2)
+        self.table = SQLTable(SQLdbObj=self.db, tableName='Items', name='TEXT')
+        self.table.enable_result_cache()
+
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.directory)
+        logging.disable(logging.NOTSET)
+
+    def test_commit_invalidates_cached_results(self):
+        self.table.insert(name='a')
+        self.assertEqual(self.table.select_all(), [])                  # Not committed => not seen by the readers
+        self.db.commit()
+        self.assertEqual(self.table.select_all(), [('a',)])
+        self.assertEqual(self.table.select_one(name='a'), [('a',)])
+
+    def test_cached_read_does_not_commit(self):
+        self.db.group_commit(milliseconds=0)
+        self.db.commit()
+        self.table.select_all()
+        self.db.cursor.execute("INSERT INTO Items(name) VALUES('b')")
+        # Only writes commit (group commit): a cached read must not take the writer
+        self.table.select_all()
+        self.assertTrue(self.db.base.in_transaction)
+
+    def test_uncommitted_rows_not_shared(self):
+        self.db.commit()
+        for i in range(3):                                              # Every reader has been used
+            self.assertEqual(self.table.select_all(), [])
+        seen = []
+
+        def read():
+            seen.append(self.table.select_all())
+
+        with self.assertRaises(KeyError):
+            with self.db.transaction():
+                self.table.insert(name='secret')
+                self.assertEqual(self.table.select_all(), [('secret',)])
+                thread = threading.Thread(target=read)
+                thread.start()
+                thread.join()
+                raise KeyError('rollback')
+        self.assertEqual(seen, [[]])
+        self.assertEqual(self.table.select_all(), [])
+
+
+class PageTest(unittest.TestCase):
+    """
+    Keyset pagination
+    """
+
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+        self.db = SQLDatabase(databaseName=':memory:')
+        self.table = SQLTable(SQLdbObj=self.db, tableName='Cars', name='TEXT PRIMARY KEY', price='INTEGER')
+        self.table.insert_many(("car%02d" % i, i % 7) for i in range(25))
+
+    def tearDown(self):
+        self.db.close()
+        logging.disable(logging.NOTSET)
+
+    def pages(self, **kwargs):
+        rows, token = self.table.page(**kwargs)
+        pages = [rows]
+        while token:
+            rows, token = self.table.page(after=token, **kwargs)
+            pages.append(rows)
+        return pages
+
+    def test_primary_key(self):
+        pages = self.pages(limit=10)
+        self.assertEqual([len(rows) for rows in pages], [10, 10, 5])
+        self.assertEqual(sum(pages, []), sorted(self.table.select_all()))
+
+    def test_order_by_with_ties_descending(self):
+        pages = self.pages(limit=4, order_by='price', descending=True, columns=['name'], where={'name': 'car1'})
+        names = [name for rows in pages for name, in rows]
+        self.assertEqual(len(names), 10)
+        self.assertEqual(len(set(names)), 10)
+
+    def test_exact_number_of_rows(self):
+        rows, token = self.table.page(limit=25)
+        self.assertEqual((len(rows), token), (25, None))
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            self.table.page(limit=0)
+        for token in ("", "garbage", encode_page_token([{'x': 1}]), "NQ=="):
+            with self.assertRaises(ValueError):
+                self.table.page(after=token)
+        rows, token = self.table.page(limit=5)
+        with self.assertRaises(ValueError):
+            self.table.page(after=token, order_by='price')
+        with self.assertRaises(SqlNameParameterError):
+            self.table.page(order_by='unknown')
+
+
+class ImportTest(unittest.TestCase):
+    """
+    Streaming import of files
+    """
+
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+        self.directory = tempfile.mkdtemp(prefix="test_sql_access")
+        self.db = SQLDatabase(databaseName=':memory:')
+
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.directory)
+        logging.disable(logging.NOTSET)
+
+    def test_import_csv_with_id_column(self):
+        table = SQLTable(SQLdbObj=self.db, tableName='Items', id='INTEGER PRIMARY KEY', name='TEXT', city='TEXT')
+        path = os.path.join(self.directory, "items.csv")
+        with open(path, 'w') as csvFile:
+            csvFile.write("name,city\nA,Paris\nB,Lyon\n")
+        self.assertEqual(table.import_csv(path), (2, 0))
+        self.assertEqual(table.select_all(), [(1, 'A', 'Paris'), (2, 'B', 'Lyon')])
+
+
+class TransferTest(unittest.TestCase):
+    """
+    copy_to / move_to between tables
+    """
+
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+        self.db = SQLDatabase(databaseName=':memory:')
+        self.table = SQLTable(SQLdbObj=self.db, tableName='Items', name='TEXT')
+        self.table.insert(name='Été')
+
+    def tearDown(self):
+        self.db.close()
+        logging.disable(logging.NOTSET)
+
+    def test_existing_item_on_destination(self):
+        dest = SQLTable(SQLdbObj=self.db, tableName='Archive', name='TEXT')
+        dest.define_filter_for_insertion(['name'])
+        dest.insert(name='ete')
+        with self.assertRaises(SqlExistOnDestinationTableError):
+            self.table.move_to(dest)
+        self.assertEqual(self.table.select_all(), [('Été',)])
+
+    def test_other_memory_database(self):
+        other = SQLDatabase(databaseName=':memory:')
+        dest = SQLTable(SQLdbObj=other, tableName='Items', name='TEXT')
+        with self.assertRaises(SqlAttachError):
+            self.table.copy_to(dest)
+        self.assertEqual(dest.select_all(), [])
+        other.close()
+
+
+class DeleteManyTest(unittest.TestCase):
+    """
+    delete & delete_many through the index of the key
+    """
+
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+        self.db = SQLDatabase(databaseName=':memory:')
+        self.table = SQLTable(SQLdbObj=self.db, tableName='Cars', name='TEXT PRIMARY KEY', brand='TEXT')
+        self.table.insert_many([('Clio', 'Renault'), ('Clio 2', 'Renault'), ('208', 'Peugeot'), ('C3', 'Citroën'),
+                                ('Zoe', 'Renault')])
+
+    def tearDown(self):
+        self.db.close()
+        logging.disable(logging.NOTSET)
+
+    def names(self):
+        return sorted(name for name, brand in self.table.select_all())
+
+    def test_in_list(self):
+        self.assertEqual(self.table.delete_many(['Clio', 'Unknown']), 1)
+        self.assertEqual(self.table.delete_many([]), 0)
+        self.assertEqual(self.names(), ['208', 'C3', 'Clio 2', 'Zoe'])
+
+    def test_temporary_table(self):
+        self.assertEqual(self.table.delete_many(iter(['Clio', '208', 'C3', 'Unknown', 'Zoe']), chunkSize=2), 4)
+        self.assertEqual(self.names(), ['Clio 2'])
+        self.db.cursor.execute("SELECT count(*) FROM temp.sqlite_master WHERE name='delete_many_keys'")
+        self.assertEqual(self.db.cursor.fetchone(), (0,))
+
+    def test_several_keys(self):
+        keys = [('Clio', 'Renault'), ('208', 'Renault'), ('C3', 'Citroën')]
+        self.assertEqual(self.table.delete_many(keys, key=['name', 'brand']), 2)
+        self.assertEqual(self.table.delete_many(keys + [('Zoe', 'Renault')], key=['name', 'brand'], chunkSize=1), 1)
+        self.assertEqual(self.names(), ['208', 'Clio 2'])
+
+    def test_rowid(self):
+        self.assertEqual(self.table.delete_many([1, 2], key='rowid'), 2)
+        self.assertEqual(self.names(), ['208', 'C3', 'Zoe'])
+        with self.assertRaises(SqlNameParameterError):
+            self.table.delete_many(['Renault'], key='model')
+
+    def test_delete_match_modes(self):
+        self.assertEqual(self.table.delete(matchMode='equal', name='Clio'), 1)
+        self.assertEqual(self.table.delete(brand='citroen'), 1)
+        self.assertEqual(self.table.delete(brand='Renault'), 2)
+        self.assertEqual(self.names(), ['208'])
+
+
+class BackupTest(unittest.TestCase):
+    """
+    Online backup & ':memory:' snapshot of the committed content
+    """
+
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+        self.directory = tempfile.mkdtemp(prefix="test_sql_access")
+        self.path = os.path.join(self.directory, "source.db")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+        logging.disable(logging.NOTSET)
+
+    def source(self, **kwargs):
+        db = SQLDatabase(databaseName=self.path, **kwargs)
+        table = SQLTable(SQLdbObj=db, tableName='Items', name='TEXT')
+        table.insert_many([('a',), ('b',), ('c',)])
+        db.commit()
+        return db, table
+
+    def rows(self, path):
+        connection = sqlite3.connect(path)
+        try:
+            return connection.execute("SELECT name FROM Items ORDER BY name").fetchall()
+        finally:
+            connection.close()
+
+    def test_backup_into_file(self):
+        db, table = self.source()
+        steps = []
+        db.backup(os.path.join(self.directory, "copy.db"), pages_per_step=1,
+                  progress=lambda status, remaining, total: steps.append(remaining))
+        db.backup(os.path.join(self.directory, "vacuum.db"), vacuum=True)
+        db.close()
+        self.assertTrue(steps and steps[-1] == 0)
+        self.assertEqual(self.rows(os.path.join(self.directory, "copy.db")), [('a',), ('b',), ('c',)])
+        self.assertEqual(self.rows(os.path.join(self.directory, "vacuum.db")), [('a',), ('b',), ('c',)])
+
+    def test_uncommitted_changes(self):
+        db, table = self.source()
+        table.insert(name='d')
+        with self.assertRaises(sqlite3.OperationalError):
+            db.backup(os.path.join(self.directory, "copy.db"))
+        with self.assertRaises(SqlTypeParameterError):
+            db.backup(SQLDatabase(databaseName=':memory:'), vacuum=True)
+        db.close()
+
+    def test_pooled_snapshot(self):
+        db, table = self.source(readers=1)
+        table.insert(name='d')                                         # Not committed => not in the snapshot
+        replica = db.snapshot()
+        self.assertEqual(sorted(replica.open_table('Items').select_all()), [('a',), ('b',), ('c',)])
+
+        # Backup into an existing SQLDatabase refreshes its result cache
+        db.commit()
+        db.backup(replica)
+        self.assertEqual(len(replica.open_table('Items').select_all()), 4)
+        replica.close()
+        db.close()
+
+
+class OpenTableTest(unittest.TestCase):
+    """
+    tables & open_table from the memoized metadata
+    """
+
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+        self.db = SQLDatabase(databaseName=':memory:')
+        table = SQLTable(SQLdbObj=self.db, tableName='Cars', name='TEXT PRIMARY KEY', price='INTEGER')
+        table.define_fulltext_keys(['name'])
+        SQLTable(SQLdbObj=self.db, tableName='Brands', name='TEXT')
+
+    def tearDown(self):
+        self.db.close()
+        logging.disable(logging.NOTSET)
+
+    def test_tables(self):
+        self.assertEqual(self.db.tables(), ['Brands', 'Cars'])
+
+    def test_open_table(self):
+        table = self.db.open_table('Cars')
+        self.assertEqual(table.tableVar, {'name': 'TEXT', 'price': 'INTEGER'})
+        self.assertEqual(table.tablePrimVar, {'name': 'TEXT'})
+        self.assertEqual(table.fulltextKey, ['name'])
+        self.assertIs(self.db.open_table('Cars'), table)
+        with self.assertRaises(SqlTableUnknown):
+            self.db.open_table('Unknown')
+
+    def test_schema_change(self):
+        table = self.db.open_table('Brands')
+        self.db.cursor.execute("ALTER TABLE Brands ADD COLUMN country TEXT")
+        self.assertIs(self.db.open_table('Brands'), table)
+        self.assertEqual(table.tableVar, {'name': 'TEXT', 'country': 'TEXT'})
+        table.insert(name='Renault', country='France')
+        self.assertEqual(table.select_all(), [('Renault', 'France')])
+
+
+if __name__ == "__main__":
+    unittest.main()